@@ -0,0 +1,132 @@
+"""
+Check of the LLM response cache against a local stub LLM, with no network or API key needed.
+
+Run with `python -m benchmarks.llm_cache`. It checks a miss followed by a hit, TTL expiry,
+least-recently-used size eviction and the `no_cache()` bypass, then compares the latency of
+a cached completion with the stub's simulated call latency.
+"""
+
+import argparse
+import contextvars
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.services.llm_cache import CachedLLM, LLMResponseCache
+
+
+class StubLLM:
+    """
+    A local stand-in for the Gemini LLM returning a deterministic completion after a fixed delay.
+
+    Attributes:
+        model (str): The model name.
+        temperature (float): The sampling temperature.
+        stop (list): The stop sequences.
+        latency (float): Seconds every call takes.
+        calls (int): Number of calls received.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.model = "stub"
+        self.temperature = 0.2
+        self.stop = []
+        self.latency = latency
+        self.calls = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return f"completion of {messages!r} ({len(messages)})"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 8192
+
+
+def check_hit_and_miss(directory: Path):
+    stub = StubLLM()
+    llm = CachedLLM(stub, LLMResponseCache(path=directory / "hit.sqlite"))
+    first = llm.call("Summarise AAPL news")
+    second = llm.call("Summarise AAPL news")
+    llm.call("Summarise MSFT news")
+    assert first == second, "a hit must return the stored completion"
+    assert stub.calls == 2, f"expected 2 stub calls, got {stub.calls}"
+    assert llm.stats == {"hits": 1, "misses": 2, "bypassed": 0}, llm.stats
+
+
+def check_ttl_expiry(directory: Path):
+    stub = StubLLM()
+    llm = CachedLLM(stub, LLMResponseCache(path=directory / "ttl.sqlite", ttl_seconds=0.2))
+    llm.call("prompt")
+    llm.call("prompt")
+    time.sleep(0.3)
+    llm.call("prompt")
+    assert stub.calls == 2, f"an expired entry must be fetched again, got {stub.calls} stub calls"
+
+
+def check_size_eviction(directory: Path):
+    stub = StubLLM()
+    # Each stub completion is about 30 bytes, so only two fit.
+    cache = LLMResponseCache(path=directory / "size.sqlite", max_size_bytes=70)
+    llm = CachedLLM(stub, cache)
+    llm.call("first")
+    llm.call("second")
+    time.sleep(0.01)
+    llm.call("first")  # Hit: 'first' is now more recently used than 'second'.
+    time.sleep(0.01)
+    llm.call("third")  # Evicts 'second', the least recently used entry.
+    calls = stub.calls
+    llm.call("first")
+    assert stub.calls == calls, "'first' was used recently and must still be cached"
+    llm.call("second")
+    assert stub.calls == calls + 1, "'second' was least recently used and must have been evicted"
+
+
+def check_bypass(directory: Path):
+    stub = StubLLM()
+    llm = CachedLLM(stub, LLMResponseCache(path=directory / "bypass.sqlite"))
+    llm.call("prompt")
+    with llm.no_cache():
+        llm.call("prompt")
+        # crewai runs agents and LLM calls in worker threads started with a copy of the context.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(contextvars.copy_context().run, llm.call, "prompt").result()
+    llm.call("prompt")
+    assert stub.calls == 3, f"only the calls inside no_cache() may bypass the cache, got {stub.calls} stub calls"
+    assert llm.stats == {"hits": 1, "misses": 1, "bypassed": 2}, llm.stats
+
+
+def time_hit(directory: Path, latency: float) -> tuple:
+    llm = CachedLLM(StubLLM(latency), LLMResponseCache(path=directory / "timing.sqlite"))
+    start = time.perf_counter()
+    llm.call("Write the report")
+    miss_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    llm.call("Write the report")
+    return miss_seconds, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM response cache check against a stub LLM.")
+    parser.add_argument("--latency", type=float, default=1.0, help="Simulated seconds per LLM call.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for check in [check_hit_and_miss, check_ttl_expiry, check_size_eviction, check_bypass]:
+            check(directory)
+            print(f"{check.__name__:<22} ok")
+
+        miss_seconds, hit_seconds = time_hit(directory, args.latency)
+        print(f"miss {miss_seconds * 1000:.1f} ms, hit {hit_seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Timing comparison of the multi-timeframe technical snapshot against separate tool calls.
+
+Run with `python -m benchmarks.multi_timeframe --ticker AAPL` (needs network access).
+The bar cache is cleared before every measured call, so each separate call pays for its
+own download as the tool did before, while the combined call downloads once.
+"""
+
+import argparse
+import time
+
+from src.services.yahoo_bar_cache import bar_cache
+from src.services.yahoo_technical_analyser import YahooTechnicalAnalyser
+
+# The periods an agent would request to look at daily, weekly and monthly trends separately.
+SEPARATE_PERIODS = ["1y", "5y", "max"]
+
+
+def time_separate_calls(ticker: str) -> float:
+    start = time.perf_counter()
+    for period in SEPARATE_PERIODS:
+        bar_cache.clear()
+        YahooTechnicalAnalyser(ticker).get_technical_data(period=period)
+    return time.perf_counter() - start
+
+
+def time_combined_call(ticker: str) -> float:
+    bar_cache.clear()
+    start = time.perf_counter()
+    YahooTechnicalAnalyser(ticker).get_technical_data(period="1y", timeframes=["1d", "1wk", "1mo"])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-timeframe snapshot timing comparison.")
+    parser.add_argument("--ticker", default="AAPL")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    separate = min(time_separate_calls(args.ticker) for _ in range(args.repeat))
+    combined = min(time_combined_call(args.ticker) for _ in range(args.repeat))
+    print(f"three separate tool calls: {separate * 1000:.0f} ms")
+    print(f"one multi-timeframe call:  {combined * 1000:.0f} ms")
+    print(f"speed-up: {separate / combined:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark of the support/resistance and chart pattern detection stage.
+
+Run with `python -m benchmarks.price_structure`. A synthetic random walk of
+20 years of daily bars is enriched once and the detection stage is timed on it.
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from src.services.yahoo_technical_analyser import YahooTechnicalAnalyser
+
+
+def make_daily_bars(years: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a synthetic OHLCV random walk of business-day bars.
+    Args:
+        years (int): Number of years of daily bars.
+        seed (int): Random seed.
+    Returns:
+        pd.DataFrame: Daily bars with 'Open', 'High', 'Low', 'Close' and 'Volume' columns.
+    """
+    rng = np.random.default_rng(seed)
+    size = years * 252
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, size)))
+    spread = close * rng.uniform(0.002, 0.02, size)
+    return pd.DataFrame(
+        {
+            "Open": close + rng.normal(0, 0.3, size) * spread,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 10_000_000, size).astype("float64"),
+        },
+        index=pd.bdate_range("2000-01-03", periods=size, name="Date"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price structure detection benchmark.")
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    analyser = YahooTechnicalAnalyser("BENCH")
+    bars = make_daily_bars(args.years)
+    enriched = analyser._enrich_with_technical_data(bars)
+
+    enrichment = min(timeit.repeat(lambda: analyser._enrich_with_technical_data(bars), number=1, repeat=args.repeat))
+    detection = min(timeit.repeat(lambda: analyser._detect_price_structure(enriched), number=1, repeat=args.repeat))
+    structure = analyser._detect_price_structure(enriched)
+
+    print(f"bars: {len(bars)}")
+    print(f"indicator enrichment: {enrichment * 1000:.2f} ms")
+    print(f"price structure detection: {detection * 1000:.2f} ms")
+    print(f"zones: {len(structure['support_zones'])} support, {len(structure['resistance_zones'])} resistance")
+    zones = structure["support_zones"] + structure["resistance_zones"]
+    widest = max((zone["zone_high"] - zone["zone_low"] for zone in zones), default=0.0)
+    print(f"widest zone: {widest:.2f} ({widest / enriched['Close'].iloc[-1] * 100:.2f}% of the last close)")
+    print(f"patterns (most recent): {[pattern['pattern'] for pattern in structure['patterns']]}")
+    print(f"confirmed (most recent): {[pattern['confirmed'] for pattern in structure['patterns']]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Load test for the shared sentiment worker.
+
+Start the worker first (`make run_sentiment_worker`), then run
+`python -m benchmarks.sentiment_worker_load`. The caller threads share one
+SentimentAnalyser, as the sessions of one process share the Reddit tool's, and send
+single-text requests in a closed loop over their own connections.
+
+With `--simulated-model` an in-process worker is started on a temporary Unix socket
+with a stand-in model whose forward pass costs a fixed overhead plus a per-text cost,
+which measures the transport and micro-batching without torch installed.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from src.services.reddit.sentiment_analyser import SentimentAnalyser
+from src.services.reddit.sentiment_worker import SentimentWorker
+
+SAMPLE_TEXTS = [
+    "Company beats earnings expectations and raises full-year guidance.",
+    "Shares slump after the regulator opens an investigation into accounting practices.",
+    "The board announced the annual general meeting will be held in June.",
+    "Analysts downgrade the stock citing weakening demand in China.",
+    "Record quarterly revenue driven by strong data center sales.",
+    "The company will report results after the market closes on Thursday.",
+]
+
+
+class SimulatedModel:
+    """
+    A stand-in for SentimentModel whose forward pass sleeps instead of running the network.
+
+    Attributes:
+        batch_ms (float): Fixed cost of one forward pass in milliseconds.
+        per_text_ms (float): Additional cost per text in milliseconds.
+    """
+
+    def __init__(self, batch_ms: float, per_text_ms: float):
+        self.batch_ms = batch_ms
+        self.per_text_ms = per_text_ms
+
+    def analyse_batch(self, texts: list) -> list:
+        time.sleep((self.batch_ms + self.per_text_ms * len(texts)) / 1000)
+        return ["neutral"] * len(texts)
+
+
+def run_callers(concurrency: int, requests_per_caller: int, address: str | None = None) -> dict:
+    """
+    Runs `concurrency` caller threads, each sending `requests_per_caller` requests.
+    Args:
+        concurrency (int): Number of concurrent callers.
+        requests_per_caller (int): Number of requests sent by every caller.
+        address (str | None): The worker address. Defaults to SENTIMENT_WORKER_ADDRESS.
+    Returns:
+        dict: Throughput in requests per second and p50/p99 latency in milliseconds.
+    """
+    latencies = []
+    latencies_lock = threading.Lock()
+    client = SentimentAnalyser(address)
+
+    def caller(offset: int):
+        client.analyse(SAMPLE_TEXTS[0])
+        barrier.wait()
+        local_latencies = []
+        for i in range(requests_per_caller):
+            text = SAMPLE_TEXTS[(offset + i) % len(SAMPLE_TEXTS)]
+            start = time.perf_counter()
+            client.analyse(text)
+            local_latencies.append((time.perf_counter() - start) * 1000)
+        with latencies_lock:
+            latencies.extend(local_latencies)
+
+    barrier = threading.Barrier(concurrency + 1)
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    # Every caller has opened its connection; start timing once all are released together.
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "concurrency": concurrency,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49],
+        "p99_ms": quantiles[98],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentiment worker load test.")
+    parser.add_argument("--requests-per-caller", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument(
+        "--simulated-model", action="store_true", help="Start an in-process worker with a stand-in model."
+    )
+    parser.add_argument("--batch-ms", type=float, default=20.0, help="Simulated forward pass overhead.")
+    parser.add_argument("--per-text-ms", type=float, default=2.0, help="Simulated cost per text.")
+    args = parser.parse_args()
+
+    address = None
+    if args.simulated_model:
+        address = os.path.join(tempfile.mkdtemp(), "sentiment.sock")
+        worker = SentimentWorker(address, model=SimulatedModel(args.batch_ms, args.per_text_ms))
+        threading.Thread(target=worker.serve_forever, daemon=True).start()
+        while not os.path.exists(address):
+            time.sleep(0.01)
+
+    if SentimentAnalyser(address)._analyse_remote(SAMPLE_TEXTS[:1]) is None:
+        raise SystemExit("Sentiment worker is not reachable, start it with `make run_sentiment_worker`.")
+
+    print(f"{'callers':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for concurrency in args.concurrency:
+        result = run_callers(concurrency, args.requests_per_caller, address)
+        print(
+            f"{result['concurrency']:>8} {result['throughput_rps']:>10.1f} "
+            f"{result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
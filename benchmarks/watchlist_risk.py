@@ -0,0 +1,76 @@
+"""
+Benchmark of the watchlist risk analytics.
+
+Run with `python -m benchmarks.watchlist_risk`. Synthetic correlated daily prices are
+generated for growing watchlists; the initial fit, the incremental per-bar update and a
+full recomputation of the window statistics with pandas are timed for each size.
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from src.services.watchlist_risk_analyser import WatchlistRiskAnalyser
+
+
+def make_closes(tickers: int, bars: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds synthetic closing prices driven by one market factor plus idiosyncratic noise.
+    Args:
+        tickers (int): Number of watchlist tickers (the 'SPY' benchmark is added).
+        bars (int): Number of daily bars.
+        seed (int): Random seed.
+    Returns:
+        pd.DataFrame: Closing prices indexed by date with one column per ticker.
+    """
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, bars)
+    loadings = rng.uniform(0.5, 1.5, tickers)
+    returns = market[:, None] * loadings + rng.normal(0, 0.015, (bars, tickers))
+    returns = np.column_stack([returns, market])
+    columns = [f"T{i:04d}" for i in range(tickers)] + ["SPY"]
+    index = pd.bdate_range("2020-01-01", periods=bars)
+    return pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=index, columns=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watchlist risk analytics benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--bars", type=int, default=504)
+    parser.add_argument("--window", type=int, default=63)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tickers':>8} {'fit ms':>10} {'update ms':>10} {'pandas ms':>10}")
+    for size in args.sizes:
+        closes = make_closes(size, args.bars + 1)
+        history, last = closes.iloc[:-1], closes.iloc[-1]
+        tickers = list(closes.columns[:-1])
+
+        def fit():
+            return WatchlistRiskAnalyser(tickers, window=args.window).fit(history)
+
+        def update():
+            analyser = fit()
+            start = timeit.default_timer()
+            analyser.add_bar(closes.index[-1], last)
+            analyser.covariance(), analyser.correlation(), analyser.betas(), analyser.volatility()
+            return timeit.default_timer() - start
+
+        def recompute():
+            returns = np.log(closes).diff().iloc[-args.window :]
+            covariance = returns.cov()
+            returns.corr()
+            covariance["SPY"] / covariance.at["SPY", "SPY"]
+            returns.std() * np.sqrt(252)
+
+        fit_seconds = min(timeit.repeat(fit, number=1, repeat=args.repeat))
+        update_seconds = min(update() for _ in range(args.repeat))
+        recompute_seconds = min(timeit.repeat(recompute, number=1, repeat=args.repeat))
+        print(f"{size:>8} {fit_seconds * 1000:>10.2f} {update_seconds * 1000:>10.2f} {recompute_seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,53 @@
+import asyncio
+import logging
+from contextlib import nullcontext
+
 from crewai import LLM, Agent, Crew, Task
 
-from src.tools.reddit_sentiment_analysis_tool import analyse_reddit
+from src.services.llm_cache import CachedLLM
+from src.services.prefetch_store import PrefetchStore, use_store
+from src.tools import (
+    reddit_sentiment_analysis_tool,
+    yahoo_analysis_tool,
+    yahoo_fundamental_analysis_tool,
+    yahoo_news_tool,
+    yahoo_technical_analysis_tool,
+)
+from src.tools.news_archive_tool import search_news_archive
+from src.tools.reddit_sentiment_analysis_tool import (
+    PREFETCH_DAYS,
+    PREFETCH_POST_LIMIT,
+    PREFETCH_SUBREDDITS,
+    analyse_reddit,
+    reddit_sentiment_trend,
+)
 from src.tools.yahoo_analysis_tool import fetch_yahoo_analysis
 from src.tools.yahoo_fundamental_analysis_tool import analyse_fundamentals
 from src.tools.yahoo_news_tool import fetch_yahoo_news
 from src.tools.yahoo_technical_analysis_tool import analyse_technical_indicators
 
+logger = logging.getLogger(__name__)
+
+PREFETCHING_TOOLS = [
+    reddit_sentiment_analysis_tool,
+    yahoo_news_tool,
+    yahoo_analysis_tool,
+    yahoo_fundamental_analysis_tool,
+    yahoo_technical_analysis_tool,
+]
+
 
 class StockAnalysisCrew:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, use_llm_cache: bool = True):
         self.api_key = api_key
         self.llm = LLM(
             model="gemini/gemini-2.0-flash",
             api_key=self.api_key,
             temperature=0.2,
         )
+        if use_llm_cache:
+            self.llm = CachedLLM(self.llm)
+        self.run_metrics: dict = {}
         self._initialize_agents_and_tasks()
 
     def _initialize_agents_and_tasks(self):
@@ -23,7 +56,7 @@ class StockAnalysisCrew:
             goal="Gather and analyze comprehensive data about {stock_symbol}",
             backstory="With a Ph.D.in Financial Economics and 15 years of experience in equity research, you're known for your meticulous data collection and insightful analysis.",
             llm=self.llm,
-            tools=[analyse_reddit, fetch_yahoo_news, fetch_yahoo_analysis],
+            tools=[analyse_reddit, reddit_sentiment_trend, fetch_yahoo_news, search_news_archive, fetch_yahoo_analysis],
             verbose=True,
             memory=True,
         )
@@ -60,9 +93,14 @@ class StockAnalysisCrew:
         research_task = Task(
             description=(
                 "Gather and analyze qualitative data and public sentiment for '{stock_symbol}' "
-                "by processing Reddit discussions (using analyse_reddit_tool), "
+                "by processing Reddit discussions (using analyse_reddit_tool with subreddits "
+                f"{PREFETCH_SUBREDDITS}, post_limit {PREFETCH_POST_LIMIT} and days {PREFETCH_DAYS}, "
+                "then reddit_sentiment_trend_tool to see how sentiment has shifted over time), "
                 "at least 20 Yahoo News articles (using fetch_yahoo_news_tool), "
-                "and Yahoo financial analyses (using fetch_yahoo_analysis_tool). "
+                "and Yahoo financial analyses (using fetch_yahoo_analysis_tool, whose estimate_changes "
+                "show which estimates moved since the previous snapshot). "
+                "When a theme emerges (e.g. guidance changes, regulation, export restrictions), "
+                "search older coverage of it with search_news_archive_tool instead of fetching more articles. "
                 "Focus on identifying the *drivers* of sentiment and the *impact* of news. "
                 "Synthesize this information to build a comprehensive picture of the current "
                 "sentiment and news landscape surrounding the stock."
@@ -85,7 +123,9 @@ class StockAnalysisCrew:
                 "historical market data and calculating a wide array of technical indicators "
                 "(using analyse_technical_indicators_tool). Your primary goal is to **interpret these indicators** "
                 "to identify trends, patterns, support/resistance levels, and potential trading signals, "
-                "explaining their significance."
+                "explaining their significance. Base support/resistance levels and chart patterns on the "
+                "detected price structure returned by the tool rather than estimating them. To check whether "
+                "daily, weekly and monthly trends align, call the tool once with timeframes ['1d', '1wk', '1mo']."
             ),
             expected_output=(
                 "A detailed textual technical analysis report for '{stock_symbol}'. This report **must**:\n"
@@ -158,5 +198,25 @@ class StockAnalysisCrew:
             verbose=True,
         )
 
-    def run(self, stock_symbol: str):
-        return self.crew.kickoff(inputs={"stock_symbol": stock_symbol.upper()})
+    def run(self, stock_symbol: str, bypass_llm_cache: bool = False):
+        stock_symbol = stock_symbol.upper()
+
+        # All tool data is known from the ticker alone, so fetch it concurrently before the agents start.
+        store = PrefetchStore()
+        jobs = {}
+        for tool_module in PREFETCHING_TOOLS:
+            jobs.update(tool_module.prefetch_jobs(stock_symbol))
+        asyncio.run(store.prefetch(jobs))
+
+        llm_stats_before = dict(self.llm.stats) if isinstance(self.llm, CachedLLM) else None
+        no_cache = self.llm.no_cache() if bypass_llm_cache and llm_stats_before is not None else nullcontext()
+        with use_store(store), no_cache:
+            result = self.crew.kickoff(inputs={"stock_symbol": stock_symbol})
+
+        self.run_metrics = {"prefetch": store.summary()}
+        if llm_stats_before is not None:
+            self.run_metrics["llm_cache"] = {
+                name: count - llm_stats_before[name] for name, count in self.llm.stats.items()
+            }
+        logger.info("Run metrics for %s: %s", stock_symbol, self.run_metrics)
+        return result
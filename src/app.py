@@ -3,10 +3,10 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 import talib as ta
-import yfinance as yf
 from markdown_it import MarkdownIt
 
 from src.agents import StockAnalysisCrew
+from src.services.yahoo_bar_cache import bar_cache
 
 INTERVAL_MAPPING = [
     {"period": "1d", "interval": "1m"},
@@ -19,9 +19,12 @@ INTERVAL_MAPPING = [
     {"period": "max", "interval": "1wk"},
 ]
 
+LIVE_PERIOD = {"period": "1d", "interval": "1m"}
+LIVE_REFRESH_SECONDS = 15
+LIVE_COLUMNS = ["Datetime", "Open", "High", "Low", "Close", "Volume"]
+
 
 def process_data(ticker, data):
-    data = data.xs(ticker, axis=1, level=1)
     if data.index.tzinfo is None:
         data.index = data.index.tz_localize("UTC")
     data.index = data.index.tz_convert("US/Eastern")
@@ -51,6 +54,59 @@ def add_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
     return data
 
 
+def build_figure(series, chart_type: str, title: str) -> go.Figure:
+    fig = go.Figure()
+    if chart_type == "Candlestick":
+        fig.add_trace(
+            go.Candlestick(
+                x=series["Datetime"],
+                open=series["Open"],
+                high=series["High"],
+                low=series["Low"],
+                close=series["Close"],
+            )
+        )
+    else:
+        fig = px.line(x=series["Datetime"], y=series["Close"])
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Time",
+        yaxis_title="Price (USD)",
+        height=600,
+    )
+    return fig
+
+
+# Append bars newer than the last one held and update the metrics incrementally
+def apply_live_update(live: dict, metrics: dict) -> bool:
+    series = live["series"]
+    new_bars = bar_cache.fetch_since(live["ticker"], LIVE_PERIOD["interval"], series["Datetime"][-1])
+    if new_bars.empty:
+        return False
+    new_bars = process_data(live["ticker"], new_bars)
+
+    for bar in new_bars[LIVE_COLUMNS].itertuples(index=False):
+        if bar.Datetime < series["Datetime"][-1]:
+            continue
+        if bar.Datetime == series["Datetime"][-1]:
+            # The last held bar was still forming, replace it with its revised values
+            metrics["volume"] -= series["Volume"][-1]
+            for column in LIVE_COLUMNS:
+                series[column][-1] = getattr(bar, column)
+        else:
+            for column in LIVE_COLUMNS:
+                series[column].append(getattr(bar, column))
+        metrics["high"] = max(metrics["high"], bar.High)
+        metrics["low"] = min(metrics["low"], bar.Low)
+        metrics["volume"] += bar.Volume
+
+    metrics["last_close"] = series["Close"][-1]
+    metrics["change"] = metrics["last_close"] - series["Close"][0]
+    metrics["pct_change"] = (metrics["change"] / series["Close"][0]) * 100
+    return True
+
+
 def format_markdown(text):
     md = MarkdownIt()
     tokens = md.parse(text)
@@ -68,13 +124,7 @@ def escape_markdown_specials(text: str) -> str:
 
 
 def load_stock_data(symbol: str, period: dict) -> pd.DataFrame:
-    return yf.download(
-        symbol,
-        period=period["period"],
-        interval=period["interval"],
-        auto_adjust=True,
-        progress=False,
-    )
+    return bar_cache.get_bars(symbol, period["period"], period["interval"])
 
 
 if "stock_fig" not in st.session_state:
@@ -83,6 +133,8 @@ if "stock_metrics" not in st.session_state:
     st.session_state.stock_metrics = None
 if "report" not in st.session_state:
     st.session_state.report = None
+if "live" not in st.session_state:
+    st.session_state.live = None
 
 
 st.set_page_config("Stock Investment Report", layout="wide")
@@ -93,6 +145,8 @@ st.sidebar.header("Configuration")
 ticker = st.sidebar.text_input("Stock symbol (eg. AAPL)")
 time_period = st.sidebar.selectbox("Time period", [period["period"] for period in INTERVAL_MAPPING])
 chart_type = st.sidebar.selectbox("Chart Type", ["Candlestick", "Line"])
+live_mode = st.sidebar.toggle("Live updates", disabled=time_period != LIVE_PERIOD["period"])
+live_mode = live_mode and time_period == LIVE_PERIOD["period"]
 api_key = st.sidebar.text_input("Gemini API key", type="password")
 sidebar_col1, sidebar_col2 = st.sidebar.columns(spec=[0.4, 0.6], gap="small")
 
@@ -110,28 +164,17 @@ if sidebar_col1.button("Update", type="primary", use_container_width=True):
         "volume": volume,
     }
 
-    fig = go.Figure()
-    if chart_type == "Candlestick":
-        fig.add_trace(
-            go.Candlestick(
-                x=data["Datetime"],
-                open=data["Open"],
-                high=data["High"],
-                low=data["Low"],
-                close=data["Close"],
-            )
-        )
-    else:
-        fig = px.line(data, x="Datetime", y="Close")
-
-    fig.update_layout(
-        title=f"{ticker} {time_period.upper()} Chart",
-        xaxis_title="Time",
-        yaxis_title="Price (USD)",
-        height=600,
-    )
+    st.session_state.stock_fig = build_figure(data, chart_type, f"{ticker} {time_period.upper()} Chart")
 
-    st.session_state.stock_fig = fig
+    # Keep the series as plain lists so live ticks only append the new bars
+    if time_period == LIVE_PERIOD["period"]:
+        st.session_state.live = {
+            "ticker": ticker,
+            "chart_type": chart_type,
+            "series": {column: data[column].tolist() for column in LIVE_COLUMNS},
+        }
+    else:
+        st.session_state.live = None
 
 if sidebar_col2.button("Generate report", type="primary", use_container_width=True):
     with st.spinner("Running multi-agent analysis…"):
@@ -141,7 +184,32 @@ if sidebar_col2.button("Generate report", type="primary", use_container_width=Tr
         report_cleaned = escape_markdown_specials(report_md)
         st.session_state.report = report_cleaned
 
-if st.session_state.stock_metrics is not None:
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS if live_mode else None)
+def show_chart():
+    live = st.session_state.live
+    if live_mode and live is not None and st.session_state.stock_metrics is not None:
+        if apply_live_update(live, st.session_state.stock_metrics):
+            series = live["series"]
+            if live["chart_type"] == "Candlestick":
+                st.session_state.stock_fig.update_traces(
+                    x=series["Datetime"],
+                    open=series["Open"],
+                    high=series["High"],
+                    low=series["Low"],
+                    close=series["Close"],
+                )
+            else:
+                st.session_state.stock_fig.update_traces(x=series["Datetime"], y=series["Close"])
+
+    if st.session_state.stock_metrics is not None:
+        show_metrics()
+
+    if st.session_state.stock_fig is not None:
+        st.plotly_chart(st.session_state.stock_fig, use_container_width=True)
+
+
+def show_metrics():
     last_close = st.session_state.stock_metrics["last_close"]
     change = st.session_state.stock_metrics["change"]
     pct_change = st.session_state.stock_metrics["pct_change"]
@@ -159,8 +227,8 @@ if st.session_state.stock_metrics is not None:
     col2.metric("Low", f"{low:.2f} USD")
     col3.metric("Volume", f"{volume:,}")
 
-if st.session_state.stock_fig is not None:
-    st.plotly_chart(st.session_state.stock_fig, use_container_width=True)
+
+show_chart()
 
 if st.session_state.report is not None:
     st.header("Investment Report")
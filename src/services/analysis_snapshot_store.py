@@ -0,0 +1,303 @@
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from src.services.storage import get_data_path
+
+ESTIMATE_TABLES = ["earnings_estimate", "revenue_estimate", "growth_estimates", "earnings_history", "eps_trend"]
+
+# Yahoo labels estimate periods relative to the last reported quarter ('0q', '+1q', '0y', '+1y');
+# earnings_history rows are keyed by the absolute quarter date instead.
+RELATIVE_QUARTER = re.compile(r"^([+-]?\d+)q$")
+RELATIVE_YEAR = re.compile(r"^[+-]?\d+y$")
+
+
+def flatten_analysis(analysis: dict) -> list:
+    """
+    Flattens the nested analysis dicts of YahooAnalysisFetcher into sorted columnar records.
+    Args:
+        analysis (dict): The output of YahooAnalysisFetcher.fetch_analysis.
+    Returns:
+        list: Sorted (table, row, field, value) tuples; missing and non-numeric values are skipped.
+    """
+    records = []
+    for table in ESTIMATE_TABLES:
+        for field, rows in analysis.get(table, {}).items():
+            for row, value in rows.items():
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if not math.isnan(value):
+                    records.append((table, str(row), str(field), value))
+    return sorted(records)
+
+
+def compact_records(records) -> dict:
+    """
+    Nests (table, row, field, value) records into the compact form returned to the agents.
+    Args:
+        records (Iterable): (table, row, field, value) tuples.
+    Returns:
+        dict: Maps table -> row -> field -> value, rounded to 4 decimals.
+    """
+    compact: dict = {}
+    for table, row, field, value in sorted(records):
+        compact.setdefault(table, {}).setdefault(row, {})[field] = round(value, 4)
+    return compact
+
+
+def missing_tables(analysis: dict, expected) -> list:
+    """
+    Lists the expected estimate tables of a fetch without any numeric value. Yahoo intermittently
+    returns tables empty which it does have, so such a fetch is incomplete rather than a change.
+    Args:
+        analysis (dict): The output of YahooAnalysisFetcher.fetch_analysis.
+        expected (Iterable): The tables the fetch should contain, e.g. those of the previous snapshot.
+    Returns:
+        list: The names of the expected tables which are empty.
+    """
+    present = {table for table, _, _, _ in flatten_analysis(analysis)}
+    return [table for table in ESTIMATE_TABLES if table in set(expected) and table not in present]
+
+
+def estimate_headline(estimates: dict) -> dict:
+    """
+    Picks the headline figures from compact estimates: the EPS and revenue consensus for the current
+    quarter and year, and the latest reported quarter against its estimate.
+    Args:
+        estimates (dict): Compact estimates, table -> period -> field -> value.
+    Returns:
+        dict: The headline figures present in the estimates.
+    """
+    headline: dict = {}
+    for table, name in [("earnings_estimate", "eps"), ("revenue_estimate", "revenue")]:
+        for period in ["0q", "0y"]:
+            row = estimates.get(table, {}).get(period, {})
+            figures = {field: row[field] for field in ["avg", "growth", "numberOfAnalysts"] if field in row}
+            if figures:
+                headline.setdefault(name, {})[period] = figures
+    history = estimates.get("earnings_history", {})
+    if history:
+        quarter = max(history)
+        headline["last_reported_quarter"] = {"quarter": quarter, **history[quarter]}
+    return headline
+
+
+def _last_reported_quarter(records: dict) -> str | None:
+    quarters = [row for table, row, _ in records if table == "earnings_history"]
+    return max(quarters) if quarters else None
+
+
+def _shift_quarter_labels(records: dict) -> dict:
+    """
+    Re-labels the estimates of a snapshot taken before a quarter was reported, so they line up with
+    the labels after it: the old '+1q' becomes '0q', the old '0q' is now history and is dropped.
+    Year labels are dropped as well, since it is unknown whether the reported quarter ended the fiscal year.
+    Args:
+        records (dict): Maps (table, row, field) to value.
+    Returns:
+        dict: The re-labelled records.
+    """
+    shifted = {}
+    for (table, row, field), value in records.items():
+        if table == "earnings_history":
+            shifted[(table, row, field)] = value
+            continue
+        quarter = RELATIVE_QUARTER.match(row)
+        if quarter:
+            offset = int(quarter.group(1)) - 1
+            if offset >= 0:
+                shifted[(table, f"{'+' if offset > 0 else ''}{offset}q", field)] = value
+        elif not RELATIVE_YEAR.match(row):
+            shifted[(table, row, field)] = value
+    return shifted
+
+
+class AnalysisSnapshotStore:
+    """
+    A persistent store of analyst-estimate snapshots per ticker and date, backed by SQLite.
+    Each distinct snapshot is stored once in columnar (table, row, field, value) form under its
+    content digest; dates whose estimates did not change only point to the existing digest.
+
+    Attributes:
+        path (Path): The SQLite database file.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = get_data_path("analysis_snapshots.sqlite") if path is None else path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                ticker TEXT NOT NULL,
+                date TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (ticker, date)
+            );
+            CREATE TABLE IF NOT EXISTS estimates (
+                digest TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                period TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS estimates_digest ON estimates (digest);
+            """
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def save(self, ticker: str, analysis: dict, date: str | None = None) -> bool:
+        """
+        Saves the snapshot of a fetch, storing its values only if they differ from every stored snapshot.
+        Args:
+            ticker (str): The stock ticker symbol.
+            analysis (dict): The output of YahooAnalysisFetcher.fetch_analysis.
+            date (str | None): The snapshot date ('YYYY-MM-DD'). Defaults to today (UTC).
+        Returns:
+            bool: True if the estimates differ from the previous snapshot of the ticker.
+        Raises:
+            ValueError: If the fetch has no estimates, or a table of the previous snapshot came back empty;
+                such a fetch must be retried, not stored. Tables Yahoo never had for the ticker are fine.
+        """
+        if not flatten_analysis(analysis):
+            raise ValueError(f"No estimates for {ticker}")
+        missing = missing_tables(analysis, self.stored_tables(ticker, date))
+        if missing:
+            raise ValueError(f"Incomplete analysis for {ticker}, empty tables: {', '.join(missing)}")
+        ticker = ticker.upper()
+        date = date or self.today()
+        records = flatten_analysis(analysis)
+        digest = hashlib.sha256(json.dumps(records).encode()).hexdigest()
+
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT digest FROM snapshots WHERE ticker = ? AND date < ? ORDER BY date DESC LIMIT 1",
+                (ticker, date),
+            ).fetchone()
+            stored = self._connection.execute("SELECT 1 FROM estimates WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+            if stored is None:
+                self._connection.executemany(
+                    "INSERT INTO estimates (digest, table_name, period, field, value) VALUES (?, ?, ?, ?, ?)",
+                    [(digest, *record) for record in records],
+                )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots (ticker, date, digest) VALUES (?, ?, ?)", (ticker, date, digest)
+            )
+            self._connection.commit()
+        return previous is None or previous[0] != digest
+
+    def stored_tables(self, ticker: str, before: str | None = None) -> set:
+        """
+        Returns the estimate tables present in the latest stored snapshot of a ticker.
+        Args:
+            ticker (str): The stock ticker symbol.
+            before (str | None): Only consider snapshots before this date ('YYYY-MM-DD'). Defaults to today.
+        Returns:
+            set: The table names, empty if there is no earlier snapshot.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT table_name FROM estimates WHERE digest = ("
+                "SELECT digest FROM snapshots WHERE ticker = ? AND date < ? ORDER BY date DESC LIMIT 1)",
+                (ticker.upper(), before or self.today()),
+            ).fetchall()
+        return {table for (table,) in rows}
+
+    def _records(self, digest: str) -> dict:
+        rows = self._connection.execute(
+            "SELECT table_name, period, field, value FROM estimates WHERE digest = ?", (digest,)
+        ).fetchall()
+        return {(table, row, field): value for table, row, field, value in rows}
+
+    def get(self, ticker: str, date: str | None = None) -> dict | None:
+        """
+        Returns a stored snapshot in compact form.
+        Args:
+            ticker (str): The stock ticker symbol.
+            date (str | None): The snapshot date ('YYYY-MM-DD'). Defaults to today (UTC).
+        Returns:
+            dict | None: Maps table -> row -> field -> value, or None if there is no snapshot for the date.
+        """
+        with self._lock:
+            snapshot = self._connection.execute(
+                "SELECT digest FROM snapshots WHERE ticker = ? AND date = ?", (ticker.upper(), date or self.today())
+            ).fetchone()
+            if snapshot is None:
+                return None
+            records = self._records(snapshot[0])
+
+        return compact_records((table, row, field, value) for (table, row, field), value in records.items())
+
+    def changes(self, ticker: str, min_change_pct: float = 0.5) -> dict:
+        """
+        Compares the latest snapshot of a ticker with the last different one before it.
+        Only estimates present in both snapshots are compared. When a quarter was reported in between,
+        the relative period labels are re-aligned first, so the new '0q' is compared with the old '+1q'.
+        Args:
+            ticker (str): The stock ticker symbol.
+            min_change_pct (float): Relative moves smaller than this (in percent) are ignored.
+        Returns:
+            dict: The dates compared ('previous_since' is when the previous estimates were first seen,
+                'changed_on' when the current ones were), the quarter reported in between if any,
+                and the estimates which moved, by how much.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT date, digest FROM snapshots WHERE ticker = ? ORDER BY date", (ticker.upper(),)
+            ).fetchall()
+            if not rows:
+                return {"changed_on": None, "previous_since": None, "reported_quarter": None, "changes": []}
+
+            # Collapse consecutive dates with identical estimates into runs: (first date, digest).
+            runs = []
+            for date, digest in rows:
+                if not runs or runs[-1][1] != digest:
+                    runs.append((date, digest))
+            if len(runs) == 1:
+                return {"changed_on": None, "previous_since": runs[0][0], "reported_quarter": None, "changes": []}
+
+            (previous_since, previous_digest), (changed_on, current_digest) = runs[-2], runs[-1]
+            previous = self._records(previous_digest)
+            current = self._records(current_digest)
+
+        reported_quarter = _last_reported_quarter(current)
+        if reported_quarter is not None and reported_quarter != _last_reported_quarter(previous):
+            previous = _shift_quarter_labels(previous)
+        else:
+            reported_quarter = None
+
+        moved = []
+        for key in sorted(previous.keys() & current.keys()):
+            old, new = previous[key], current[key]
+            if old == new:
+                continue
+            change_pct = (new - old) / abs(old) * 100 if old != 0 else None
+            if change_pct is not None and abs(change_pct) < min_change_pct:
+                continue
+            table, row, field = key
+            moved.append(
+                {
+                    "table": table,
+                    "period": row,
+                    "field": field,
+                    "previous": round(old, 4),
+                    "current": round(new, 4),
+                    "change_pct": round(change_pct, 2) if change_pct is not None else None,
+                }
+            )
+        return {
+            "changed_on": changed_on,
+            "previous_since": previous_since,
+            "reported_quarter": reported_quarter,
+            "changes": moved,
+        }
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from crewai.llms.base_llm import BaseLLM
+
+from src.services.storage import get_data_path
+
+try:
+    from crewai.llms.base_llm import call_stop_override
+except ImportError:  # crewai < 1.0 sets the stop words on the LLM instance instead.
+    call_stop_override = None
+
+
+class LLMResponseCache:
+    """
+    A persistent, content-addressed store of LLM completions backed by SQLite.
+    Entries expire after `ttl_seconds`; once the stored responses exceed `max_size_bytes`,
+    the least recently used entries are evicted.
+
+    Attributes:
+        path (Path): The SQLite database file.
+        ttl_seconds (float): Age after which an entry is no longer served.
+        max_size_bytes (int): Maximum total size of the stored responses.
+    """
+
+    def __init__(self, path: str | None = None, ttl_seconds: float = 7 * 24 * 3600, max_size_bytes: int = 50_000_000):
+        self.path = get_data_path("llm_cache.sqlite") if path is None else path
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(model: str, temperature: float | None, messages, tools, stop) -> str:
+        """
+        Hashes everything that determines a completion into a cache key.
+        Args:
+            model (str): The model name.
+            temperature (float | None): The sampling temperature.
+            messages (str | list): The prompt or chat messages.
+            tools (list | None): The tool schemas offered to the model.
+            stop (list | None): The stop sequences.
+        Returns:
+            str: The SHA-256 hex digest of the canonical JSON of the inputs.
+        """
+        payload = {"model": model, "temperature": temperature, "messages": messages, "tools": tools, "stop": stop}
+        canonical = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Returns a cached response, or None if it is missing or expired.
+        Args:
+            key (str): The cache key.
+        Returns:
+            str | None: The cached response.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created = row
+            if now - created > self.ttl_seconds:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._connection.commit()
+                return None
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+        return response
+
+    def put(self, key: str, response: str):
+        """
+        Stores a response and evicts least recently used entries beyond the size limit.
+        Args:
+            key (str): The cache key.
+            response (str): The completion to store.
+        """
+        now = time.time()
+        size = len(response.encode())
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._connection.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+            (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            if total > self.max_size_bytes:
+                rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+                evicted = []
+                for evicted_key, evicted_size in rows:
+                    if total <= self.max_size_bytes:
+                        break
+                    evicted.append((evicted_key,))
+                    total -= evicted_size
+                self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            self._connection.commit()
+
+
+# Ids of the CachedLLMs whose cache is bypassed in the current context. A context variable rather than
+# a thread-local, because crewai copies the context into the worker threads it runs agents and LLM calls in.
+_bypassed: ContextVar[frozenset] = ContextVar("bypassed_llm_caches", default=frozenset())
+
+_shared_cache: LLMResponseCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Returns the process-wide LLM response cache, opening its database on first use.
+    Returns:
+        LLMResponseCache: The shared cache.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+        return _shared_cache
+
+
+class CachedLLM(BaseLLM):
+    """
+    An LLM wrapper serving repeated completions from an LLMResponseCache.
+    It wraps any object exposing `model`, `temperature` and crewai's `call` signature, so a
+    local stub can stand in for the real Gemini LLM. Attributes not defined here are read
+    from the wrapped LLM. Agents call `call` themselves, so calls are excluded from the cache
+    with the `no_cache()` block around the crew run.
+
+    Attributes:
+        llm (BaseLLM): The wrapped LLM.
+        cache (LLMResponseCache): The response store. Defaults to the shared one.
+        stats (dict): Counts of cache 'hits', 'misses' and 'bypassed' calls.
+    """
+
+    def __init__(self, llm, cache: LLMResponseCache | None = None):
+        super().__init__(model=llm.model, temperature=llm.temperature)
+        # Set after the base initialiser, and past pydantic's field handling on crewai >= 1.0.
+        object.__setattr__(self, "llm", llm)
+        object.__setattr__(self, "cache", cache if cache is not None else get_llm_cache())
+        object.__setattr__(self, "stats", {"hits": 0, "misses": 0, "bypassed": 0})
+        object.__setattr__(self, "_stats_lock", threading.Lock())
+
+    def _count(self, outcome: str):
+        with self._stats_lock:
+            self.stats[outcome] += 1
+
+    def __getattr__(self, name: str):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    @contextmanager
+    def no_cache(self):
+        """
+        Disables the cache for calls made inside the block, including those crewai makes from
+        worker threads it starts with a copy of the current context.
+        """
+        token = _bypassed.set(_bypassed.get() | {id(self)})
+        try:
+            yield
+        finally:
+            _bypassed.reset(token)
+
+    def _stop_words(self) -> list:
+        # crewai >= 1.0 scopes the agent's stop words to the call; older versions set them on the LLM.
+        return list(getattr(self, "stop_sequences", None) or self.stop or [])
+
+    def _call_llm(self, messages, stop: list, **kwargs):
+        """
+        Calls the wrapped LLM with the stop words crewai set on this wrapper.
+        """
+        if call_stop_override is not None and isinstance(self.llm, BaseLLM):
+            with call_stop_override(self.llm, stop):
+                return self.llm.call(messages, **kwargs)
+        self.llm.stop = stop
+        return self.llm.call(messages, **kwargs)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        """
+        Returns a cached completion for identical inputs, or calls the wrapped LLM and stores its response.
+        Args:
+            messages (str | list): The prompt or chat messages.
+            tools (list | None): The tool schemas offered to the model.
+            callbacks (list | None): Callbacks passed to the wrapped LLM.
+            available_functions (dict | None): Functions the wrapped LLM may execute.
+            **kwargs: Further arguments of newer crewai versions, passed to the wrapped LLM.
+        Returns:
+            str | Any: The completion.
+        """
+        stop = self._stop_words()
+        kwargs.update(tools=tools, callbacks=callbacks, available_functions=available_functions)
+        if id(self) in _bypassed.get():
+            self._count("bypassed")
+            return self._call_llm(messages, stop, **kwargs)
+
+        key = self.cache.make_key(self.llm.model, self.llm.temperature, messages, tools, stop)
+        response = self.cache.get(key)
+        if response is not None:
+            self._count("hits")
+            return response
+
+        self._count("misses")
+        response = self._call_llm(messages, stop, **kwargs)
+        if isinstance(response, str) and response:
+            self.cache.put(key, response)
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return self.llm.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
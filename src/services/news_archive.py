@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+
+from src.services.storage import get_data_path
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = set(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits text into lowercase alphanumeric terms, dropping common stopwords.
+    Args:
+        text (str): The text to tokenize.
+    Returns:
+        list: The terms.
+    """
+    return [term for term in re.findall(r"[a-z0-9]+", text.lower()) if term not in STOPWORDS]
+
+
+class NewsArchive:
+    """
+    A persistent, deduplicated archive of news articles for one ticker with an in-memory
+    inverted index over titles and summaries, searchable with BM25 ranking.
+    Articles are stored in SQLite keyed by their id, so several processes can archive the same
+    ticker concurrently; the index is extended with the rows any of them added.
+
+    Attributes:
+        ticker (str): The stock ticker symbol.
+        path (Path): The SQLite database the articles are persisted to.
+        articles (dict): Maps an article id to the article dict.
+        postings (dict): Maps a term to a mapping of article id to term frequency.
+        lengths (dict): Maps an article id to its number of terms.
+    """
+
+    def __init__(self, ticker: str, path: str | None = None):
+        self.ticker = ticker.upper()
+        self.path = get_data_path("news_archive.sqlite") if path is None else path
+        self.articles: dict = {}
+        self.postings: dict = defaultdict(dict)
+        self.lengths: dict = {}
+        self._lock = threading.Lock()
+        self._last_rowid = 0
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                ticker TEXT NOT NULL,
+                id TEXT NOT NULL,
+                article TEXT NOT NULL,
+                PRIMARY KEY (ticker, id)
+            );
+            """
+        )
+        self._connection.commit()
+        with self._lock:
+            self._sync()
+
+    @staticmethod
+    def article_id(article: dict) -> str:
+        """
+        Derives a stable id for an article from its title and publication date.
+        Args:
+            article (dict): The article with 'title' and 'pubDate' keys.
+        Returns:
+            str: The article id.
+        """
+        key = f"{article.get('title', '').strip().lower()}|{article.get('pubDate', '')}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def _index(self, article_id: str, article: dict):
+        terms = Counter(tokenize(f"{article.get('title', '')} {article.get('summary', '')}"))
+        for term, frequency in terms.items():
+            self.postings[term][article_id] = frequency
+        self.lengths[article_id] = sum(terms.values())
+
+    def _sync(self):
+        """
+        Indexes the articles stored since the last sync, by this or any other process. Must hold the lock.
+        """
+        rows = self._connection.execute(
+            "SELECT rowid, id, article FROM articles WHERE ticker = ? AND rowid > ? ORDER BY rowid",
+            (self.ticker, self._last_rowid),
+        ).fetchall()
+        for rowid, article_id, article in rows:
+            self._last_rowid = rowid
+            try:
+                article = json.loads(article)
+            except json.JSONDecodeError as e:
+                logger.warning("Skipping unreadable archived article %s of %s (%s)", article_id, self.ticker, e)
+                continue
+            self.articles[article_id] = article
+            self._index(article_id, article)
+
+    def add(self, articles: list) -> int:
+        """
+        Stores articles in the archive, skipping ones already present, and indexes them.
+        Args:
+            articles (list): Articles as returned by YahooNewsFetcher.fetch_news.
+        Returns:
+            int: The number of newly archived articles.
+        """
+        added = 0
+        with self._lock:
+            for article in articles:
+                article_id = self.article_id(article)
+                if article_id in self.articles:
+                    continue
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO articles (ticker, id, article) VALUES (?, ?, ?)",
+                    (self.ticker, article_id, json.dumps(article)),
+                )
+                added += cursor.rowcount
+            self._connection.commit()
+            self._sync()
+        return added
+
+    def search(self, query: str, top_k: int = 5, k1: float = 1.5, b: float = 0.75) -> list:
+        """
+        Ranks archived articles against a query with BM25.
+        Args:
+            query (str): Free-text query, e.g. 'guidance cut'.
+            top_k (int): Maximum number of articles returned.
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 document length normalisation.
+        Returns:
+            list: The best matching articles, each with an added 'score' key, best first.
+        """
+        with self._lock:
+            self._sync()
+            count = len(self.articles)
+            if count == 0:
+                return []
+            average_length = sum(self.lengths.values()) / count or 1.0
+
+            scores: dict = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for article_id, frequency in postings.items():
+                    norm = k1 * (1 - b + b * self.lengths[article_id] / average_length)
+                    scores[article_id] += idf * frequency * (k1 + 1) / (frequency + norm)
+
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            return [{**self.articles[article_id], "score": round(score, 3)} for article_id, score in best]
+
+
+_archives: dict = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(ticker: str) -> NewsArchive:
+    """
+    Returns the shared news archive of a ticker, indexing its stored articles on first use.
+    Args:
+        ticker (str): The stock ticker symbol.
+    Returns:
+        NewsArchive: The archive of the ticker.
+    """
+    ticker = ticker.upper()
+    with _archives_lock:
+        if ticker not in _archives:
+            _archives[ticker] = NewsArchive(ticker)
+        return _archives[ticker]
+
+
+def archive_news(ticker: str, articles: list) -> int:
+    """
+    Adds freshly fetched articles to the ticker's archive.
+    Args:
+        ticker (str): The stock ticker symbol.
+        articles (list): Articles as returned by YahooNewsFetcher.fetch_news.
+    Returns:
+        int: The number of newly archived articles.
+    """
+    return get_archive(ticker).add(articles)
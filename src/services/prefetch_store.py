@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchStore:
+    """
+    A per-run store of data fetched concurrently before the crew starts.
+    Tools look their data up here first and only go to the network on a miss.
+    Every lookup is traced, so a run can report how much tool latency was avoided.
+
+    Attributes:
+        entries (dict): Maps a key (tuple) to a (value, fetch duration in seconds) pair.
+        prefetch_seconds (float): Wall-clock duration of the prefetch stage.
+        tool_calls (list): Trace of tool lookups as dicts with 'key', 'hit' and 'seconds'.
+    """
+
+    def __init__(self):
+        self.entries: dict = {}
+        self.prefetch_seconds = 0.0
+        self.tool_calls: list = []
+        self._lock = threading.Lock()
+
+    async def prefetch(self, jobs: dict):
+        """
+        Runs all fetch jobs concurrently in worker threads and stores their results.
+        A failing job is logged and left out, so its tool falls back to a live fetch.
+        Args:
+            jobs (dict): Maps a key (tuple) to a zero-argument callable returning the data.
+        """
+
+        async def run_job(key: tuple, fetch):
+            start = time.perf_counter()
+            try:
+                value = await asyncio.to_thread(fetch)
+            except Exception as e:
+                logger.warning("Prefetch of %s failed: %s", key, e)
+                return
+            self.entries[key] = (value, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run_job(key, fetch) for key, fetch in jobs.items()))
+        self.prefetch_seconds = time.perf_counter() - start
+
+    def get_or_fetch(self, key: tuple, fetch):
+        """
+        Returns the prefetched value for a key, or fetches it live on a miss.
+        Args:
+            key (tuple): The key identifying the data.
+            fetch (callable): A zero-argument callable fetching the data live.
+        Returns:
+            Any: The prefetched or freshly fetched value.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, seconds = entry
+            hit = True
+        else:
+            start = time.perf_counter()
+            value = fetch()
+            seconds = time.perf_counter() - start
+            hit = False
+        with self._lock:
+            self.tool_calls.append({"key": key, "hit": hit, "seconds": seconds})
+        return value
+
+    def summary(self) -> dict:
+        """
+        Summarises the prefetch stage and the tool lookups of the run.
+        Returns:
+            dict: Prefetch wall time, summed fetch time, hits, misses and the tool latency avoided.
+        """
+        hits = [call for call in self.tool_calls if call["hit"]]
+        misses = [call for call in self.tool_calls if not call["hit"]]
+        return {
+            "prefetch_wall_seconds": round(self.prefetch_seconds, 3),
+            "prefetch_fetch_seconds": round(sum(seconds for _, seconds in self.entries.values()), 3),
+            "tool_hits": len(hits),
+            "tool_misses": len(misses),
+            "tool_seconds_avoided": round(sum(call["seconds"] for call in hits), 3),
+            "tool_seconds_live": round(sum(call["seconds"] for call in misses), 3),
+        }
+
+
+# The store of the run in progress. A context variable rather than a global, because Streamlit serves
+# every browser session from its own thread of one process and concurrent runs must not see each other's store.
+_active_store: ContextVar[PrefetchStore | None] = ContextVar("active_prefetch_store", default=None)
+
+
+@contextmanager
+def use_store(store: PrefetchStore):
+    """
+    Makes a store the one tools look their data up in, for the current thread or task, inside the block.
+    Work started with asyncio.to_thread or a copied context sees the same store.
+    Args:
+        store (PrefetchStore): The store of the run.
+    """
+    token = _active_store.set(store)
+    try:
+        yield store
+    finally:
+        _active_store.reset(token)
+
+
+def get_or_fetch(key: tuple, fetch):
+    """
+    Looks data up in the store of the run in progress, or fetches it live when no run is active.
+    Args:
+        key (tuple): The key identifying the data.
+        fetch (callable): A zero-argument callable fetching the data live.
+    Returns:
+        Any: The prefetched or freshly fetched value.
+    """
+    store = _active_store.get()
+    if store is None:
+        return fetch()
+    return store.get_or_fetch(key, fetch)
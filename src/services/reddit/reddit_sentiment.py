@@ -1,5 +1,6 @@
 from src.services.reddit.reddit_client import RedditClient
 from src.services.reddit.sentiment_analyser import SentimentAnalyser
+from src.services.reddit.sentiment_history import SentimentHistoryStore
 
 
 class RedditSentimentAnalyser:
@@ -9,15 +10,19 @@ class RedditSentimentAnalyser:
     Attributes:
         reddit_client (RedditClient): An instance of the RedditClient to fetch posts.
         sentiment_analyser (SentimentAnalyser): An instance of the SentimentAnalyser to analyse sentiment.
+        history (SentimentHistoryStore): The store of scored posts and their sentiment rollups.
     """
 
     def __init__(self):
         self.reddit_client = RedditClient()
         self.sentiment_analyser = SentimentAnalyser()
+        self.history = SentimentHistoryStore()
 
     def analyse(self, subreddits: list, stock: str, post_limit: int = 50, days: int = 30) -> dict:
         """
         Analyses Reddit sentiment for a given stock across multiple subreddits.
+        Posts scored in earlier runs are not scored again, but their score and comment count are
+        updated in the history; new posts are added to it.
         Args:
             subreddits (list): A list of subreddit names (e.g., ['stocks', 'investing']).
             stock (str): The stock ticker or keyword to search for (e.g., 'AAPL').
@@ -29,8 +34,44 @@ class RedditSentimentAnalyser:
         sentiment_counts = {"neutral": 0, "negative": 0, "positive": 0}
         for subreddit in subreddits:
             posts = self.reddit_client.get_posts(subreddit, stock, post_limit, days)
-            for post in posts:
-                text = f"{post.title}\n{post.selftext}"
-                sentiment = self.sentiment_analyser.analyse(text)
+            known = self.history.get_sentiments(stock, [post.id for post in posts])
+            new_posts = [post for post in posts if post.id not in known]
+
+            texts = [f"{post.title}\n{post.selftext}" for post in new_posts]
+            scored = []
+            for post, sentiment in zip(new_posts, self.sentiment_analyser.analyse_batch(texts)):
+                scored.append(
+                    {
+                        "id": post.id,
+                        "subreddit": subreddit,
+                        "created_utc": post.created_utc,
+                        "score": post.score,
+                        "num_comments": post.num_comments,
+                        "sentiment": sentiment,
+                    }
+                )
+            self.history.add_posts(stock, scored)
+            self.history.update_engagement(
+                stock,
+                [
+                    {"id": post.id, "score": post.score, "num_comments": post.num_comments}
+                    for post in posts
+                    if post.id in known
+                ],
+            )
+
+            for sentiment in [*known.values(), *(post["sentiment"] for post in scored)]:
                 sentiment_counts[sentiment] += 1
         return sentiment_counts
+
+    def trend(self, stock: str, bucket: str = "day", periods: int = 30) -> list:
+        """
+        Returns the sentiment trend of a stock from the stored rollups, without fetching or scoring posts.
+        Args:
+            stock (str): The stock ticker symbol (e.g., 'AAPL').
+            bucket (str): 'day' or 'hour'.
+            periods (int): Number of most recent buckets to cover.
+        Returns:
+            list: Per-bucket counts, score-weighted sentiment ratio and momentum, oldest first.
+        """
+        return self.history.trend(stock, bucket, periods)
@@ -1,29 +1,138 @@
-import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
+import logging
+import threading
+import time
 
-torch.classes.__path__ = []
+from src.services.reddit.sentiment_worker import (
+    connect,
+    get_worker_address,
+    get_worker_timeout,
+    parse_address,
+    recv_message,
+    send_message,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before trying an unavailable worker again, doubling on every failure up to the maximum.
+INITIAL_RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
 
 
 class SentimentAnalyser:
     """
     A class to analyse sentiment using a pre-trained model.
-    This class uses the Hugging Face Transformers library to load a pre-trained
-    sentiment analysis model and tokenizer. It provides a method to analyse the
-    sentiment of a given text input.
+    Texts are sent to the shared SentimentWorker, which holds a single copy of the
+    model and scores requests from many processes in micro-batches. Every thread uses its
+    own connection, so concurrent sessions of one process can share a micro-batch.
+    When the worker cannot be reached, fails, or does not answer within `timeout` seconds,
+    the model is loaded in-process and used instead; the worker is tried again after a
+    backoff, and the in-process copy is released once it answers again.
     Attributes:
-        tokenizer (AutoTokenizer): The tokenizer for the pre-trained model.
-        model (AutoModelForSequenceClassification): The pre-trained sentiment analysis model.
+        address (tuple | str): The address of the sentiment worker.
+        timeout (float): Seconds to wait for the worker before falling back.
         labels (list): List of sentiment labels.
     """
 
-    def __init__(self):
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
-        )
-        self.model = AutoModelForSequenceClassification.from_pretrained(
-            "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
-        )
+    def __init__(self, address: str | None = None, timeout: float | None = None):
+        self.address = parse_address(address or get_worker_address())
+        self.timeout = get_worker_timeout() if timeout is None else timeout
         self.labels = ["negative", "neutral", "positive"]
+        self._local = threading.local()
+        self._local_model = None
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+        self._retry_delay = INITIAL_RETRY_DELAY
+
+    def _analyse_remote(self, texts: list) -> list | None:
+        """
+        Sends texts to the sentiment worker over the calling thread's connection.
+        Args:
+            texts (list): The texts to analyse.
+        Returns:
+            list | None: The sentiment labels, or None if the worker is unavailable, too slow, failed or misbehaved.
+        """
+        deadline = time.monotonic() + self.timeout
+        try:
+            if getattr(self._local, "connection", None) is None:
+                self._local.connection = connect(self.address, self.timeout)
+                self._local.buffer = bytearray()
+            send_message(self._local.connection, {"texts": texts})
+            response = recv_message(self._local.connection, self._local.buffer, deadline)
+        except (OSError, ValueError):
+            # Includes socket.timeout; a late answer must not be read as the reply to the next request.
+            self._disconnect()
+            return None
+        if isinstance(response, dict) and "error" in response:
+            logger.warning("Sentiment worker failed: %s", response["error"])
+            return None
+        labels = response.get("labels") if isinstance(response, dict) else None
+        if not isinstance(labels, list) or len(labels) != len(texts) or not set(labels) <= set(self.labels):
+            self._disconnect()
+            return None
+        return labels
+
+    def _disconnect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
+        self._local.connection = None
+
+    def _analyse_local(self, texts: list) -> list:
+        """
+        Analyses texts with an in-process copy of the model, loading it on first use.
+        Args:
+            texts (list): The texts to analyse.
+        Returns:
+            list: The sentiment labels.
+        """
+        with self._lock:
+            if self._local_model is None:
+                from src.services.reddit.sentiment_model import SentimentModel
+
+                self._local_model = SentimentModel()
+            model = self._local_model
+        return model.analyse_batch(texts)
+
+    def _score(self, texts: list) -> list:
+        """
+        Scores texts with the worker unless it is backing off, and in-process otherwise.
+        Args:
+            texts (list): The non-empty texts to analyse.
+        Returns:
+            list: The sentiment labels.
+        """
+        if time.monotonic() >= self._retry_at:
+            labels = self._analyse_remote(texts)
+            with self._lock:
+                if labels is not None:
+                    # The worker is back: release the in-process copy of the model.
+                    self._local_model = None
+                    self._retry_delay = INITIAL_RETRY_DELAY
+                    return labels
+                self._retry_at = time.monotonic() + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, MAX_RETRY_DELAY)
+        return self._analyse_local(texts)
+
+    def analyse_batch(self, texts: list) -> list:
+        """
+        Analyses the sentiment of several texts at once.
+        Args:
+            texts (list): The input texts to analyse.
+        Returns:
+            list: The sentiment labels ('positive', 'neutral', 'negative'), in input order.
+        """
+        labels = ["neutral"] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text and text.strip() not in ("[removed]", "[deleted]")]
+        if not indices:
+            return labels
+
+        scored = self._score([texts[i] for i in indices])
+        for i, label in zip(indices, scored):
+            labels[i] = label
+        return labels
 
     def analyse(self, text: str) -> str:
         """
@@ -33,10 +142,4 @@ class SentimentAnalyser:
         Returns:
             str: The sentiment label ('positive', 'neutral', 'negative').
         """
-        if not text or text.strip() in ("[removed]", "[deleted]"):
-            return "neutral"
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-        with torch.inference_mode():
-            outputs = self.model(**inputs)
-        scores = outputs.logits.softmax(dim=1).numpy()[0]
-        return self.labels[scores.argmax()]
+        return self.analyse_batch([text])[0]
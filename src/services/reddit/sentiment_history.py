@@ -0,0 +1,234 @@
+import math
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from src.services.storage import get_data_path
+
+BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+
+
+def post_weight(score: int, num_comments: int) -> float:
+    """
+    Weight of a post in the score-weighted sentiment ratio: popular posts count more,
+    with logarithmic damping so a single viral post does not dominate a bucket.
+    Args:
+        score (int): The Reddit score of the post.
+        num_comments (int): The number of comments on the post.
+    Returns:
+        float: The weight, at least 1.
+    """
+    return 1.0 + math.log1p(max(score, 0) + max(num_comments, 0))
+
+
+class SentimentHistoryStore:
+    """
+    A persistent store of scored Reddit posts with hourly and daily sentiment rollups per ticker.
+    Rollups are updated incrementally when posts are added or their engagement changes, so trend queries never re-score
+    or re-aggregate raw posts.
+
+    Attributes:
+        path (Path): The SQLite database file.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = get_data_path("reddit_sentiment.sqlite") if path is None else path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                subreddit TEXT NOT NULL,
+                created_utc REAL NOT NULL,
+                score INTEGER NOT NULL,
+                num_comments INTEGER NOT NULL,
+                sentiment TEXT NOT NULL,
+                PRIMARY KEY (ticker, id)
+            );
+            CREATE TABLE IF NOT EXISTS rollups (
+                ticker TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                positive INTEGER NOT NULL,
+                neutral INTEGER NOT NULL,
+                negative INTEGER NOT NULL,
+                weighted_positive REAL NOT NULL,
+                weighted_negative REAL NOT NULL,
+                weight REAL NOT NULL,
+                PRIMARY KEY (ticker, bucket, bucket_start)
+            );
+            """
+        )
+        self._connection.commit()
+
+    def get_sentiments(self, ticker: str, post_ids: list) -> dict:
+        """
+        Returns the stored sentiment of already scored posts.
+        Args:
+            ticker (str): The stock ticker symbol.
+            post_ids (list): Reddit post ids.
+        Returns:
+            dict: Maps the ids of stored posts to their sentiment label.
+        """
+        if not post_ids:
+            return {}
+        placeholders = ", ".join("?" * len(post_ids))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id, sentiment FROM posts WHERE ticker = ? AND id IN ({placeholders})",
+                (ticker.upper(), *post_ids),
+            ).fetchall()
+        return dict(rows)
+
+    def _add_to_rollups(self, ticker: str, created_utc: float, sentiment: str, count: int, weight: float):
+        """
+        Adds a post, or a change in its weight, to its hourly and daily rollup rows.
+        Args:
+            ticker (str): The upper-case stock ticker symbol.
+            created_utc (float): The creation time of the post.
+            sentiment (str): The sentiment label of the post.
+            count (int): 1 for a new post, 0 for a change in weight only.
+            weight (float): The weight, or weight change, to add.
+        """
+        for bucket, seconds in BUCKET_SECONDS.items():
+            bucket_start = int(created_utc // seconds * seconds)
+            self._connection.execute(
+                "INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (ticker, bucket, bucket_start) DO UPDATE SET "
+                "positive = positive + excluded.positive, "
+                "neutral = neutral + excluded.neutral, "
+                "negative = negative + excluded.negative, "
+                "weighted_positive = weighted_positive + excluded.weighted_positive, "
+                "weighted_negative = weighted_negative + excluded.weighted_negative, "
+                "weight = weight + excluded.weight",
+                (
+                    ticker,
+                    bucket,
+                    bucket_start,
+                    count if sentiment == "positive" else 0,
+                    count if sentiment == "neutral" else 0,
+                    count if sentiment == "negative" else 0,
+                    weight if sentiment == "positive" else 0.0,
+                    weight if sentiment == "negative" else 0.0,
+                    weight,
+                ),
+            )
+
+    def add_posts(self, ticker: str, posts: list) -> int:
+        """
+        Stores scored posts and folds the new ones into the hourly and daily rollups.
+        Args:
+            ticker (str): The stock ticker symbol.
+            posts (list): Dicts with 'id', 'subreddit', 'created_utc', 'score', 'num_comments' and 'sentiment'.
+        Returns:
+            int: The number of newly stored posts.
+        """
+        ticker = ticker.upper()
+        added = 0
+        with self._lock:
+            for post in posts:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO posts (id, ticker, subreddit, created_utc, score, num_comments, sentiment) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        post["id"],
+                        ticker,
+                        post["subreddit"],
+                        post["created_utc"],
+                        post["score"],
+                        post["num_comments"],
+                        post["sentiment"],
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    continue
+                added += 1
+                weight = post_weight(post["score"], post["num_comments"])
+                self._add_to_rollups(ticker, post["created_utc"], post["sentiment"], 1, weight)
+            self._connection.commit()
+        return added
+
+    def update_engagement(self, ticker: str, posts: list) -> int:
+        """
+        Updates the score and comment count of stored posts and moves the change in their
+        weight into the hourly and daily rollups. Posts are usually first seen shortly after
+        being submitted, before they have gathered votes or comments.
+        Args:
+            ticker (str): The stock ticker symbol.
+            posts (list): Dicts with 'id', 'score' and 'num_comments'; unknown ids are ignored.
+        Returns:
+            int: The number of posts whose engagement changed.
+        """
+        ticker = ticker.upper()
+        updated = 0
+        with self._lock:
+            for post in posts:
+                row = self._connection.execute(
+                    "SELECT created_utc, score, num_comments, sentiment FROM posts WHERE ticker = ? AND id = ?",
+                    (ticker, post["id"]),
+                ).fetchone()
+                if row is None:
+                    continue
+                created_utc, score, num_comments, sentiment = row
+                if (score, num_comments) == (post["score"], post["num_comments"]):
+                    continue
+                updated += 1
+                self._connection.execute(
+                    "UPDATE posts SET score = ?, num_comments = ? WHERE ticker = ? AND id = ?",
+                    (post["score"], post["num_comments"], ticker, post["id"]),
+                )
+                delta = post_weight(post["score"], post["num_comments"]) - post_weight(score, num_comments)
+                self._add_to_rollups(ticker, created_utc, sentiment, 0, delta)
+            self._connection.commit()
+        return updated
+
+    def trend(self, ticker: str, bucket: str = "day", periods: int = 30, momentum_window: int = 3) -> list:
+        """
+        Returns the sentiment trend series of a ticker from the rollups.
+        Args:
+            ticker (str): The stock ticker symbol.
+            bucket (str): 'day' or 'hour'.
+            periods (int): Number of most recent buckets to cover.
+            momentum_window (int): Number of preceding non-empty buckets the momentum is measured against.
+        Returns:
+            list: One dict per non-empty bucket, oldest first, with counts, the score-weighted
+                ratio (-1 all negative .. 1 all positive) and its momentum versus the preceding buckets.
+        """
+        if bucket not in BUCKET_SECONDS:
+            raise ValueError(f"Unsupported bucket: {bucket}")
+        seconds = BUCKET_SECONDS[bucket]
+        now = datetime.now(timezone.utc).timestamp()
+        since = int(now // seconds * seconds) - (periods - 1 + momentum_window) * seconds
+        display_since = since + momentum_window * seconds
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT bucket_start, positive, neutral, negative, weighted_positive, weighted_negative, weight "
+                "FROM rollups WHERE ticker = ? AND bucket = ? AND bucket_start >= ? ORDER BY bucket_start",
+                (ticker.upper(), bucket, since),
+            ).fetchall()
+
+        series = []
+        ratios = []
+        time_format = "%Y-%m-%d" if bucket == "day" else "%Y-%m-%d %H:00"
+        for bucket_start, positive, neutral, negative, weighted_positive, weighted_negative, weight in rows:
+            ratio = (weighted_positive - weighted_negative) / weight if weight else 0.0
+            previous = ratios[-momentum_window:]
+            momentum = ratio - sum(previous) / len(previous) if previous else None
+            ratios.append(ratio)
+            if bucket_start < display_since:
+                continue
+            series.append(
+                {
+                    "bucket": datetime.fromtimestamp(bucket_start, tz=timezone.utc).strftime(time_format),
+                    "posts": positive + neutral + negative,
+                    "positive": positive,
+                    "neutral": neutral,
+                    "negative": negative,
+                    "weighted_ratio": round(ratio, 3),
+                    "momentum": round(momentum, 3) if momentum is not None else None,
+                }
+            )
+        return series
@@ -0,0 +1,41 @@
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+torch.classes.__path__ = []
+
+MODEL_NAME = "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
+
+
+class SentimentModel:
+    """
+    A class wrapping the pre-trained financial news sentiment model.
+    It is used both in-process by the SentimentAnalyser fallback and by the
+    shared SentimentWorker, and scores texts in batches.
+
+    Attributes:
+        tokenizer (AutoTokenizer): The tokenizer for the pre-trained model.
+        model (AutoModelForSequenceClassification): The pre-trained sentiment analysis model.
+        labels (list): List of sentiment labels.
+    """
+
+    def __init__(self):
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        self.model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+        self.model.eval()
+        self.labels = ["negative", "neutral", "positive"]
+
+    def analyse_batch(self, texts: list) -> list:
+        """
+        Analyses the sentiment of a batch of texts in a single forward pass.
+        Args:
+            texts (list): The input texts to analyse. They must be non-empty.
+        Returns:
+            list: The sentiment labels ('positive', 'neutral', 'negative'), in input order.
+        """
+        if not texts:
+            return []
+        inputs = self.tokenizer(texts, return_tensors="pt", truncation=True, padding=True, max_length=512)
+        with torch.inference_mode():
+            outputs = self.model(**inputs)
+        predictions = outputs.logits.argmax(dim=1).tolist()
+        return [self.labels[prediction] for prediction in predictions]
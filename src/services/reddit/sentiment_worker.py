@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_ADDRESS = "localhost:6123"
+DEFAULT_TIMEOUT = 30.0
+
+# Requests larger than this are rejected; a Reddit batch is a few hundred kilobytes at most.
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+def get_worker_address() -> str:
+    """
+    Returns the configured address of the sentiment worker.
+    Returns:
+        str: The value of SENTIMENT_WORKER_ADDRESS, or the default localhost address.
+    """
+    return os.getenv("SENTIMENT_WORKER_ADDRESS", DEFAULT_ADDRESS)
+
+
+def get_worker_timeout() -> float:
+    """
+    Returns how long a client waits for the sentiment worker before falling back to the in-process model.
+    Returns:
+        float: The value of SENTIMENT_WORKER_TIMEOUT in seconds, or the default.
+    """
+    return float(os.getenv("SENTIMENT_WORKER_TIMEOUT", DEFAULT_TIMEOUT))
+
+
+def parse_address(address: str) -> tuple | str:
+    """
+    Parses a worker address into a socket address.
+    Args:
+        address (str): Either 'host:port' for TCP or a filesystem path for a Unix socket.
+    Returns:
+        tuple | str: A (host, port) tuple for TCP, or the socket path unchanged.
+    """
+    if "/" in address:
+        return address
+    host, _, port = address.rpartition(":")
+    return (host or "localhost", int(port))
+
+
+def send_message(sock: socket.socket, message: dict):
+    """
+    Sends a message as a single line of JSON.
+    Args:
+        sock (socket.socket): The connected socket.
+        message (dict): The JSON-serialisable message.
+    """
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def recv_message(sock: socket.socket, buffer: bytearray, deadline: float | None = None) -> dict | None:
+    """
+    Reads the next line of JSON from a socket.
+    Args:
+        sock (socket.socket): The connected socket.
+        buffer (bytearray): Bytes received beyond the previous message; consumed and refilled in place.
+        deadline (float | None): time.monotonic() value after which socket.timeout is raised.
+    Returns:
+        dict | None: The decoded message, or None if the peer closed the connection.
+    """
+    while b"\n" not in buffer:
+        if len(buffer) > MAX_MESSAGE_BYTES:
+            raise ValueError("Message too large")
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("Timed out waiting for the sentiment worker")
+            sock.settimeout(remaining)
+        chunk = sock.recv(65536)
+        if not chunk:
+            return None
+        buffer.extend(chunk)
+    line, _, rest = bytes(buffer).partition(b"\n")
+    buffer[:] = rest
+    return json.loads(line)
+
+
+def connect(address: tuple | str, timeout: float) -> socket.socket:
+    """
+    Opens a connection to the sentiment worker.
+    Args:
+        address (tuple | str): The TCP (host, port) or Unix socket path.
+        timeout (float): Connection timeout in seconds.
+    Returns:
+        socket.socket: The connected socket.
+    """
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    return socket.create_connection(address, timeout=timeout)
+
+
+class _PendingRequest:
+    """
+    A single client request waiting to be scored as part of a micro-batch.
+
+    Attributes:
+        texts (list): The texts sent by the client.
+        labels (list): The sentiment labels, set once the batch has been scored.
+        error (str): The error message, set if scoring the batch failed.
+        done (threading.Event): Set once labels or error are available.
+    """
+
+    def __init__(self, texts: list):
+        self.texts = texts
+        self.labels = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class SentimentWorker:
+    """
+    A local inference server holding a single copy of the sentiment model.
+    Clients exchange newline-delimited JSON with it: a request is {"texts": [...]} and the
+    response is {"labels": [...]} or {"error": "..."}. Nothing received is unpickled or executed.
+    Requests from many clients are collected into micro-batches: the first request
+    opens a batch, which is then filled for at most `max_wait_ms` or until it holds
+    `max_batch_size` texts, and is scored in one forward pass.
+
+    Attributes:
+        address (tuple | str): The TCP (host, port) or Unix socket path to listen on.
+        max_batch_size (int): Maximum number of texts scored in one forward pass.
+        max_wait_ms (float): Maximum time a request waits for the batch to fill up.
+        model (SentimentModel): The shared sentiment model.
+    """
+
+    def __init__(self, address: tuple | str, max_batch_size: int = 32, max_wait_ms: float = 10.0, model=None):
+        if model is None:
+            from src.services.reddit.sentiment_model import SentimentModel
+
+            model = SentimentModel()
+        self.address = address
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.model = model
+        self._requests: queue.Queue = queue.Queue()
+
+    def _collect_batch(self) -> list:
+        """
+        Blocks until a request arrives, then gathers further requests within the latency window.
+        Returns:
+            list: The pending requests forming the next micro-batch.
+        """
+        batch = [self._requests.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run_batches(self):
+        """
+        Scores micro-batches forever and hands the labels back to the waiting requests.
+        """
+        while True:
+            batch = self._collect_batch()
+            texts = [text for request in batch for text in request.texts]
+            try:
+                labels = self.model.analyse_batch(texts)
+            except Exception as e:
+                for request in batch:
+                    request.error = str(e)
+                    request.done.set()
+                continue
+
+            offset = 0
+            for request in batch:
+                request.labels = labels[offset : offset + len(request.texts)]
+                offset += len(request.texts)
+                request.done.set()
+
+    def _serve_client(self, sock: socket.socket):
+        """
+        Handles a single client connection until the client disconnects or sends an invalid message.
+        Args:
+            sock (socket.socket): The accepted client socket.
+        """
+        buffer = bytearray()
+        with sock:
+            while True:
+                try:
+                    message = recv_message(sock, buffer)
+                except (OSError, ValueError):
+                    return
+                if message is None:
+                    return
+
+                texts = message.get("texts") if isinstance(message, dict) else None
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    response = {"error": "Expected {'texts': [str, ...]}"}
+                elif not texts:
+                    response = {"labels": []}
+                else:
+                    request = _PendingRequest(texts)
+                    self._requests.put(request)
+                    request.done.wait()
+                    response = {"error": request.error} if request.error else {"labels": request.labels}
+                try:
+                    send_message(sock, response)
+                except OSError:
+                    return
+
+    def _listen(self) -> socket.socket:
+        """
+        Opens the listening socket. A Unix socket is only accessible to the current user.
+        Returns:
+            socket.socket: The listening socket.
+        """
+        if not isinstance(self.address, str):
+            return socket.create_server(self.address)
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous_umask = os.umask(0o177)
+        try:
+            server.bind(self.address)
+        finally:
+            os.umask(previous_umask)
+        server.listen()
+        return server
+
+    def serve_forever(self):
+        """
+        Starts the batching thread and accepts client connections until interrupted.
+        """
+        threading.Thread(target=self._run_batches, daemon=True).start()
+        with self._listen() as server:
+            print(f"Sentiment worker listening on {self.address}")
+            while True:
+                sock, _ = server.accept()
+                threading.Thread(target=self._serve_client, args=(sock,), daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared sentiment inference worker.")
+    parser.add_argument("--address", default=get_worker_address(), help="'host:port' or a Unix socket path.")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    worker = SentimentWorker(
+        parse_address(args.address),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
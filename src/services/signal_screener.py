@@ -0,0 +1,340 @@
+import argparse
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from src.services.storage import get_data_path
+from src.services.yahoo_bar_cache import EXCHANGE_TIMEZONE
+from src.services.yahoo_technical_analyser import YahooTechnicalAnalyser
+
+SIGNAL_COLUMNS = [
+    "Golden_Cross_50_200",
+    "Death_Cross_50_200",
+    "Short_Term_Bullish_Cross_20_50",
+    "Short_Term_Bearish_Cross_20_50",
+    "RSI_Oversold",
+    "RSI_Overbought",
+    "MACD_Bullish_Cross",
+    "MACD_Bearish_Cross",
+    "Price_Above_Upper_Band",
+    "Price_Below_Lower_Band",
+    "Bollinger_Squeeze",
+    "Stoch_Oversold",
+    "Stoch_Overbought",
+    "Stoch_Bullish_Cross",
+    "Stoch_Bearish_Cross",
+    "Volume_Spike",
+]
+
+# Columns of the trailing daily bars persisted with the index.
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Bars kept per ticker for incremental updates: enough to warm up the 200-bar moving averages.
+HISTORY_BARS = 260
+
+# Daily bars are final once the regular session has closed.
+SESSION_CLOSE = pd.Timedelta(hours=16)
+
+
+def drop_unfinished_bar(bars: pd.DataFrame, now: pd.Timestamp | None = None) -> pd.DataFrame:
+    """
+    Drops today's daily bar while the session is still open, as its prices and volume are still forming.
+    Args:
+        bars (pd.DataFrame): Daily OHLCV bars indexed by date.
+        now (pd.Timestamp | None): The current time. Defaults to now.
+    Returns:
+        pd.DataFrame: The bars without a still-forming bar.
+    """
+    if bars.empty:
+        return bars
+    now = (now or pd.Timestamp.now(tz="UTC")).tz_convert(EXCHANGE_TIMEZONE)
+    if now - now.normalize() >= SESSION_CLOSE:
+        return bars
+    last = bars.index[-1]
+    if last.tz is not None:
+        last = last.tz_convert(EXCHANGE_TIMEZONE)
+    return bars.iloc[:-1] if last.date() >= now.date() else bars
+
+
+def _compute_signal_events(ticker: str, data: pd.DataFrame, since: pd.Timestamp | None) -> tuple:
+    """
+    Computes the signal features for one ticker and extracts the bars on which each signal fired.
+    Runs inside a worker process of the screener's process pool.
+    Args:
+        ticker (str): The stock ticker symbol.
+        data (pd.DataFrame): Daily OHLCV bars for the ticker.
+        since (pd.Timestamp | None): Only events strictly after this date are returned. None returns all.
+    Returns:
+        tuple: The ticker, a list of (date, signal) events and the trailing bars kept for updates.
+    """
+    analyser = YahooTechnicalAnalyser(ticker)
+    enriched = analyser._enrich_with_technical_data(data)
+    enriched = analyser._enrich_with_advanced_features(enriched)
+
+    if since is not None:
+        enriched = enriched[enriched.index > since]
+    flags = enriched[SIGNAL_COLUMNS].fillna(False).to_numpy(dtype=bool)
+    rows, cols = np.nonzero(flags)
+    dates = enriched.index.strftime("%Y-%m-%d")
+    events = [(dates[row], SIGNAL_COLUMNS[col]) for row, col in zip(rows, cols)]
+
+    return ticker, events, data.iloc[-HISTORY_BARS:]
+
+
+class SignalScreener:
+    """
+    A class that computes technical signal events across a universe of tickers and keeps
+    them in an index by date, signal and ticker, so that screens are answered from memory.
+
+    Attributes:
+        path (Path): The SQLite database the index and trailing bars are persisted to.
+        max_workers (int | None): Number of worker processes used to compute the features.
+        events (dict): Maps a date ('YYYY-MM-DD') to a mapping of signal name to a set of tickers.
+        history (dict): Maps a ticker to its trailing daily bars, used for incremental updates.
+    """
+
+    def __init__(self, path: str | None = None, max_workers: int | None = None):
+        self.path = get_data_path("signal_index.sqlite") if path is None else path
+        self.max_workers = max_workers
+        self.events: dict = defaultdict(lambda: defaultdict(set))
+        self.history: dict = {}
+
+    @staticmethod
+    def _download(tickers: list, period: str, chunk_size: int = 100) -> dict:
+        """
+        Downloads daily bars for many tickers, a chunk of tickers per request.
+        Args:
+            tickers (list): The stock ticker symbols.
+            period (str): The period to download (e.g. '2y', '5d').
+            chunk_size (int): Number of tickers per download request.
+        Returns:
+            dict: Maps each ticker to its DataFrame of daily OHLCV bars.
+        """
+        bars = {}
+        for start in range(0, len(tickers), chunk_size):
+            chunk = tickers[start : start + chunk_size]
+            data = yf.download(chunk, period=period, auto_adjust=True, group_by="ticker", progress=False)
+            for ticker in chunk:
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                ticker_data = drop_unfinished_bar(data[ticker].dropna(how="all"))
+                if not ticker_data.empty:
+                    bars[ticker] = ticker_data
+        return bars
+
+    def _index(self, jobs: list):
+        """
+        Computes signal events for the given jobs in the process pool and adds them to the index.
+        Args:
+            jobs (list): A list of (ticker, bars, since) tuples.
+        """
+        if not jobs:
+            return
+        tickers, frames, since = zip(*jobs)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for ticker, events, tail in executor.map(_compute_signal_events, tickers, frames, since, chunksize=16):
+                for date, signal in events:
+                    self.events[date][signal].add(ticker)
+                self.history[ticker] = tail
+
+    def build(self, tickers: list, period: str = "2y"):
+        """
+        Builds the signal index from scratch for a universe of tickers.
+        Args:
+            tickers (list): The stock ticker symbols forming the universe.
+            period (str): The period of daily history to index.
+        """
+        self.events.clear()
+        self.history.clear()
+        bars = self._download(tickers, period)
+        self._index([(ticker, data, None) for ticker, data in bars.items()])
+
+    def add_bars(self, ticker: str, bars: pd.DataFrame):
+        """
+        Appends new daily bars for one ticker and indexes only the events on those bars.
+        Args:
+            ticker (str): The stock ticker symbol.
+            bars (pd.DataFrame): New daily OHLCV bars. A bar for the last date already held replaces it.
+        """
+        _, events, tail = _compute_signal_events(ticker, *self._extend_history(ticker, drop_unfinished_bar(bars)))
+        for date, signal in events:
+            self.events[date][signal].add(ticker)
+        self.history[ticker] = tail
+
+    def _extend_history(self, ticker: str, bars: pd.DataFrame) -> tuple:
+        """
+        Combines the trailing bars held for a ticker with newly arrived bars.
+        When the new bars include the last date already held, that bar is replaced by the revised one
+        and its events are dropped from the index, so they are recomputed from the final bar.
+        Args:
+            ticker (str): The stock ticker symbol.
+            bars (pd.DataFrame): Newly arrived daily OHLCV bars.
+        Returns:
+            tuple: The combined bars and the date after which events are to be indexed.
+        """
+        held = self.history.get(ticker)
+        if held is None or held.empty:
+            return bars, None
+        last_held = held.index[-1]
+        if last_held not in bars.index:
+            return pd.concat([held, bars[bars.index > last_held]]), last_held
+
+        by_signal = self.events.get(last_held.strftime("%Y-%m-%d"), {})
+        for tickers in by_signal.values():
+            tickers.discard(ticker)
+        since = held.index[-2] if len(held) > 1 else None
+        return pd.concat([held[held.index < last_held], bars[bars.index >= last_held]]), since
+
+    def update(self, period: str = "5d"):
+        """
+        Fetches the latest daily bars for every indexed ticker and indexes the new events.
+        Args:
+            period (str): How far back to fetch, to cover any missed sessions.
+        """
+        bars = self._download(list(self.history), period)
+        self._index([(ticker, *self._extend_history(ticker, data)) for ticker, data in bars.items()])
+
+    def latest_date(self) -> str | None:
+        """
+        Returns the most recent date present in the index.
+        Returns:
+            str | None: The date ('YYYY-MM-DD'), or None if the index is empty.
+        """
+        return max(self.events) if self.events else None
+
+    def screen(self, signals: list, date: str | None = None) -> list:
+        """
+        Returns the tickers on which all of the given signals fired on a date.
+        Args:
+            signals (list): Signal names, e.g. ['RSI_Oversold', 'Volume_Spike'].
+            date (str | None): The date ('YYYY-MM-DD'). Defaults to the latest indexed date.
+        Returns:
+            list: The sorted ticker symbols matching every signal.
+        """
+        if not signals:
+            raise ValueError("At least one signal is required")
+        unknown = set(signals) - set(SIGNAL_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown signals: {sorted(unknown)}")
+        date = date or self.latest_date()
+        if date is None or date not in self.events:
+            return []
+        by_signal = self.events[date]
+        matches = set.intersection(*(by_signal.get(signal, set()) for signal in signals))
+        return sorted(matches)
+
+    def save(self):
+        """
+        Persists the index and the trailing bars to disk, replacing the stored ones in one transaction.
+        """
+        events = [
+            (date, signal, ticker)
+            for date, by_signal in self.events.items()
+            for signal, tickers in by_signal.items()
+            for ticker in tickers
+        ]
+        bars = [
+            (ticker, date.strftime("%Y-%m-%d"), *map(float, values))
+            for ticker, data in self.history.items()
+            for date, *values in data[BAR_COLUMNS].itertuples(name=None)
+        ]
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM events")
+            connection.execute("DELETE FROM bars")
+            connection.executemany("INSERT INTO events VALUES (?, ?, ?)", events)
+            connection.executemany("INSERT INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)", bars)
+
+    def load(self) -> bool:
+        """
+        Loads a previously persisted index from disk.
+        Returns:
+            bool: True if an index was loaded, False if none exists yet.
+        """
+        with closing(self._connect()) as connection:
+            events = connection.execute("SELECT date, signal, ticker FROM events").fetchall()
+            bars = connection.execute(
+                "SELECT ticker, date, open, high, low, close, volume FROM bars ORDER BY ticker, date"
+            ).fetchall()
+        if not bars:
+            return False
+        self.events.clear()
+        for date, signal, ticker in events:
+            self.events[date][signal].add(ticker)
+        frame = pd.DataFrame(bars, columns=["Ticker", "Date", *BAR_COLUMNS])
+        frame["Date"] = pd.to_datetime(frame["Date"])
+        self.history = {
+            ticker: data.set_index("Date").drop(columns="Ticker") for ticker, data in frame.groupby("Ticker")
+        }
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                date TEXT NOT NULL,
+                signal TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                PRIMARY KEY (date, signal, ticker)
+            );
+            CREATE TABLE IF NOT EXISTS bars (
+                ticker TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume REAL,
+                PRIMARY KEY (ticker, date)
+            );
+            """
+        )
+        return connection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Universe-wide technical signal screener.")
+    parser.add_argument("--max-workers", type=int, default=None, help="Worker processes computing the features.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Build the index from scratch for a universe of tickers.")
+    build.add_argument("tickers", nargs="*", help="Ticker symbols, e.g. AAPL MSFT.")
+    build.add_argument("--tickers-file", help="A file with one ticker symbol per line.")
+    build.add_argument("--period", default="2y", help="Period of daily history to index.")
+    update = commands.add_parser("update", help="Index the latest daily bars of every indexed ticker.")
+    update.add_argument("--period", default="5d", help="How far back to fetch, to cover missed sessions.")
+    screen = commands.add_parser("screen", help="List the tickers on which all given signals fired.")
+    screen.add_argument("signals", nargs="+", choices=SIGNAL_COLUMNS, metavar="SIGNAL")
+    screen.add_argument("--date", help="The date (YYYY-MM-DD). Defaults to the latest indexed date.")
+    args = parser.parse_args()
+
+    screener = SignalScreener(max_workers=args.max_workers)
+    if args.command == "build":
+        tickers = [ticker.upper() for ticker in args.tickers]
+        if args.tickers_file:
+            with open(args.tickers_file) as f:
+                tickers += [line.strip().upper() for line in f if line.strip()]
+        if not tickers:
+            parser.error("build needs ticker symbols or --tickers-file")
+        screener.build(list(dict.fromkeys(tickers)), period=args.period)
+        screener.save()
+        print(f"Indexed {len(screener.history)} tickers up to {screener.latest_date()}")
+        return
+
+    if not screener.load():
+        parser.error(f"no signal index at {screener.path}, run the build command first")
+    if args.command == "update":
+        screener.update(period=args.period)
+        screener.save()
+        print(f"Updated {len(screener.history)} tickers up to {screener.latest_date()}")
+    else:
+        date = args.date or screener.latest_date()
+        print(f"{date}: {', '.join(screener.screen(args.signals, date)) or 'no matches'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATA_DIR = Path(os.getenv("STOCK_ANALYSIS_DATA_DIR", "data"))
+
+
+def get_data_path(*parts: str) -> Path:
+    """
+    Returns a path inside the local data directory, creating its parent directories.
+    Args:
+        *parts (str): Path components relative to the data directory.
+    Returns:
+        Path: The resolved path.
+    """
+    path = DATA_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
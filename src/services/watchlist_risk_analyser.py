@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+
+from src.services.yahoo_bar_cache import watchlist_bar_cache
+
+TRADING_DAYS = 252
+
+
+class WatchlistRiskAnalyser:
+    """
+    A class computing rolling risk analytics for a whole watchlist at once: return covariance
+    and correlation matrices, betas against a benchmark, realised volatility and drawdowns.
+
+    The rolling window is kept as running sums of returns and of their cross products, so a new
+    bar updates every statistic in O(N^2) for N tickers instead of recomputing the whole window.
+
+    Attributes:
+        tickers (list): The watchlist tickers with enough data, followed by the benchmark.
+        benchmark (str): The benchmark ticker (e.g. 'SPY').
+        window (int): Number of daily returns in the rolling window.
+        last_date (pd.Timestamp): Date of the latest bar included.
+    """
+
+    def __init__(self, tickers: list, benchmark: str = "SPY", window: int = 63):
+        self.benchmark = benchmark
+        self.window = window
+        self.tickers = [ticker for ticker in tickers if ticker != benchmark] + [benchmark]
+        self.last_date = None
+        self._returns = None
+        self._position = 0
+        self._updates = 0
+        self._sums = None
+        self._cross = None
+        self._last_prices = None
+        self._peaks = None
+        self._max_drawdowns = None
+
+    def load(self, period: str = "1y") -> "WatchlistRiskAnalyser":
+        """
+        Downloads daily bars for the watchlist and the benchmark and initialises the analytics.
+        Args:
+            period (str): The period of daily history to download; it must exceed the window.
+        Returns:
+            WatchlistRiskAnalyser: The analyser itself.
+        """
+        bars = watchlist_bar_cache.get_bars_many(self.tickers, period, "1d")
+        closes = pd.DataFrame({ticker: data["Close"] for ticker, data in bars.items()})
+        return self.fit(closes)
+
+    def fit(self, closes: pd.DataFrame) -> "WatchlistRiskAnalyser":
+        """
+        Initialises the rolling state from a history of closing prices.
+        Tickers without prices over the whole window are dropped.
+        Args:
+            closes (pd.DataFrame): Closing prices indexed by date with one column per ticker.
+        Returns:
+            WatchlistRiskAnalyser: The analyser itself.
+        """
+        if self.benchmark not in closes.columns:
+            raise ValueError(f"No prices for benchmark {self.benchmark}")
+        closes = closes.sort_index().ffill()
+        recent = closes.iloc[-(self.window + 1) :]
+        if len(recent) <= self.window:
+            raise ValueError(f"At least {self.window + 1} bars are required, got {len(recent)}")
+        complete = recent.columns[recent.notna().all().to_numpy()]
+        self.tickers = [ticker for ticker in self.tickers if ticker in complete and ticker != self.benchmark]
+        self.tickers.append(self.benchmark)
+        closes = closes[self.tickers]
+
+        prices = closes.to_numpy(dtype="float64")
+        returns = np.diff(np.log(prices[-(self.window + 1) :]), axis=0)
+        self._returns = returns.copy()
+        self._position = 0
+        self._updates = 0
+        self._recompute_sums()
+
+        # Drawdowns use the whole history; peaks are carried forward on every new bar.
+        history = np.where(np.isnan(prices), -np.inf, prices)
+        peaks = np.maximum.accumulate(history, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdowns = np.where(np.isfinite(peaks), prices / peaks - 1, 0.0)
+        self._peaks = peaks[-1]
+        self._max_drawdowns = np.nanmin(drawdowns, axis=0)
+        self._last_prices = prices[-1]
+        self.last_date = closes.index[-1]
+        return self
+
+    def _recompute_sums(self):
+        self._sums = self._returns.sum(axis=0)
+        self._cross = self._returns.T @ self._returns
+
+    def add_bar(self, date: pd.Timestamp, closes: pd.Series):
+        """
+        Adds one new daily bar, sliding the window forward by one return.
+        Args:
+            date (pd.Timestamp): The date of the bar; bars not newer than the last one are ignored.
+            closes (pd.Series): Closing prices indexed by ticker. Missing prices are carried forward.
+        """
+        if self.last_date is not None and date <= self.last_date:
+            return
+        prices = closes.reindex(self.tickers).to_numpy(dtype="float64")
+        prices = np.where(np.isnan(prices), self._last_prices, prices)
+        new_returns = np.log(prices / self._last_prices)
+
+        old_returns = self._returns[self._position]
+        self._sums += new_returns - old_returns
+        self._cross += np.outer(new_returns, new_returns) - np.outer(old_returns, old_returns)
+        self._returns[self._position] = new_returns
+        self._position = (self._position + 1) % self.window
+
+        # Running sums accumulate floating point error; rebuild them exactly once per window.
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._recompute_sums()
+
+        self._peaks = np.maximum(self._peaks, prices)
+        self._max_drawdowns = np.minimum(self._max_drawdowns, prices / self._peaks - 1)
+        self._last_prices = prices
+        self.last_date = date
+
+    def covariance(self) -> pd.DataFrame:
+        """
+        Returns the sample covariance matrix of daily log returns over the rolling window.
+        Returns:
+            pd.DataFrame: The covariance matrix, indexed by ticker on both axes.
+        """
+        covariance = (self._cross - np.outer(self._sums, self._sums) / self.window) / (self.window - 1)
+        return pd.DataFrame(covariance, index=self.tickers, columns=self.tickers)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Returns the correlation matrix of daily log returns over the rolling window.
+        Returns:
+            pd.DataFrame: The correlation matrix, indexed by ticker on both axes.
+        """
+        covariance = self.covariance().to_numpy()
+        std = np.sqrt(np.clip(np.diag(covariance), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = covariance / np.outer(std, std)
+        return pd.DataFrame(correlation, index=self.tickers, columns=self.tickers)
+
+    def betas(self) -> pd.Series:
+        """
+        Returns each ticker's beta against the benchmark over the rolling window.
+        Returns:
+            pd.Series: Betas indexed by ticker.
+        """
+        covariance = self.covariance().to_numpy()
+        return pd.Series(covariance[:, -1] / covariance[-1, -1], index=self.tickers)
+
+    def volatility(self) -> pd.Series:
+        """
+        Returns the annualised realised volatility of each ticker over the rolling window.
+        Returns:
+            pd.Series: Volatilities indexed by ticker.
+        """
+        variance = np.clip(np.diag(self.covariance().to_numpy()), 0, None)
+        return pd.Series(np.sqrt(variance * TRADING_DAYS), index=self.tickers)
+
+    def drawdowns(self) -> pd.DataFrame:
+        """
+        Returns the current drawdown from the running peak and the maximum drawdown of each ticker.
+        Returns:
+            pd.DataFrame: 'Drawdown' and 'Max_Drawdown' columns (fractions, <= 0), indexed by ticker.
+        """
+        return pd.DataFrame(
+            {"Drawdown": self._last_prices / self._peaks - 1, "Max_Drawdown": self._max_drawdowns},
+            index=self.tickers,
+        )
+
+    def summary(self, top_pairs: int = 10) -> dict:
+        """
+        Summarises the watchlist risk compactly.
+        Args:
+            top_pairs (int): Number of most correlated ticker pairs returned.
+        Returns:
+            dict: Per-ticker beta, volatility and drawdowns, and the most correlated pairs.
+        """
+        correlation = self.correlation().to_numpy()[:-1, :-1]
+        rows, cols = np.triu_indices(len(correlation), k=1)
+        values = correlation[rows, cols]
+        order = np.argsort(-np.nan_to_num(values, nan=-np.inf))[:top_pairs]
+
+        betas, volatility, drawdowns = self.betas(), self.volatility(), self.drawdowns()
+        return {
+            "as_of": self.last_date.strftime("%Y-%m-%d"),
+            "benchmark": self.benchmark,
+            "window": self.window,
+            "tickers": {
+                ticker: {
+                    "beta": round(float(betas[ticker]), 3),
+                    "volatility": round(float(volatility[ticker]), 4),
+                    "drawdown": round(float(drawdowns.at[ticker, "Drawdown"]), 4),
+                    "max_drawdown": round(float(drawdowns.at[ticker, "Max_Drawdown"]), 4),
+                }
+                for ticker in self.tickers[:-1]
+            },
+            "most_correlated": [
+                {
+                    "pair": [self.tickers[rows[i]], self.tickers[cols[i]]],
+                    "correlation": round(float(values[i]), 3),
+                }
+                for i in order
+            ],
+        }
@@ -0,0 +1,290 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import yfinance as yf
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+OHLCV_AGGREGATION = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+EXCHANGE_TIMEZONE = "US/Eastern"
+
+# Bar length in minutes for intraday intervals.
+INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+
+# Intervals which can be derived from each non-intraday interval; intraday bars can build any coarser one.
+DERIVABLE_FROM = {"1d": {"1d", "1wk", "1mo"}, "1wk": {"1wk"}, "1mo": {"1mo"}}
+
+# Approximate calendar span of each period, used to decide whether cached bars cover a request.
+PERIOD_DAYS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 31,
+    "3mo": 92,
+    "6mo": 183,
+    "1y": 366,
+    "2y": 731,
+    "5y": 1827,
+    "10y": 3653,
+    "max": float("inf"),
+}
+
+
+def period_days(period: str) -> float:
+    """
+    Returns the approximate number of calendar days spanned by a Yahoo period.
+    Args:
+        period (str): A Yahoo period such as '5d', '6mo', 'ytd' or 'max'.
+    Returns:
+        float: The span in days.
+    """
+    if period == "ytd":
+        today = pd.Timestamp.now(tz=EXCHANGE_TIMEZONE)
+        return today.dayofyear
+    return PERIOD_DAYS[period]
+
+
+def _is_intraday(interval: str) -> bool:
+    return interval in INTRADAY_MINUTES
+
+
+def _can_derive(source: str, target: str) -> bool:
+    """
+    Checks whether bars of the target interval can be built by resampling bars of the source interval.
+    Args:
+        source (str): The interval of the available bars.
+        target (str): The requested interval.
+    Returns:
+        bool: True if the target can be derived from the source.
+    """
+    if _is_intraday(source):
+        if _is_intraday(target):
+            return INTRADAY_MINUTES[target] % INTRADAY_MINUTES[source] == 0
+        return True
+    return target in DERIVABLE_FROM.get(source, set())
+
+
+def resample_ohlcv(data: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregates OHLCV bars into a coarser interval, aligned to the US/Eastern trading session.
+    Intraday bars are anchored at the 9:30 open, daily bars follow the Eastern calendar date,
+    weekly bars start on Monday and monthly bars on the first day of the month, as Yahoo does.
+    Args:
+        data (pd.DataFrame): OHLCV bars with a DatetimeIndex.
+        interval (str): The target interval (e.g. '30m', '1d', '1wk', '1mo').
+    Returns:
+        pd.DataFrame: The resampled OHLCV bars. Empty buckets (nights, weekends, holidays) are dropped.
+    """
+    bars = data[OHLCV_COLUMNS]
+    if bars.index.tz is not None:
+        bars = bars.tz_convert(EXCHANGE_TIMEZONE)
+
+    if _is_intraday(interval):
+        resampled = bars.resample(f"{INTRADAY_MINUTES[interval]}min", origin="start_day", offset="30min").agg(
+            OHLCV_AGGREGATION
+        )
+        index_name = "Datetime"
+    else:
+        if bars.index.tz is not None:
+            bars = bars.tz_localize(None)
+        if interval == "1d":
+            resampled = bars.resample("1D").agg(OHLCV_AGGREGATION)
+        elif interval == "1wk":
+            resampled = bars.resample("W-MON", label="left", closed="left").agg(OHLCV_AGGREGATION)
+        elif interval == "1mo":
+            resampled = bars.resample("MS").agg(OHLCV_AGGREGATION)
+        else:
+            raise ValueError(f"Unsupported interval: {interval}")
+        index_name = "Date"
+
+    resampled = resampled.dropna(subset=["Open"])
+    resampled.index.name = index_name
+    return resampled
+
+
+def slice_period(data: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Keeps only the bars which fall into a Yahoo period, counted back from the latest bar.
+    Args:
+        data (pd.DataFrame): OHLCV bars with a DatetimeIndex.
+        period (str): A Yahoo period such as '5d', '6mo', 'ytd' or 'max'.
+    Returns:
+        pd.DataFrame: The bars within the period.
+    """
+    if data.empty or period == "max":
+        return data
+
+    index = data.index.tz_convert(EXCHANGE_TIMEZONE) if data.index.tz is not None else data.index
+    if period.endswith("d"):
+        # Yahoo counts day periods in trading sessions rather than calendar days.
+        sessions = index.normalize().unique()
+        start = sessions[-int(period[:-1]) :][0]
+    elif period == "ytd":
+        start = index[-1].replace(month=1, day=1).normalize()
+    elif period.endswith("mo"):
+        start = index[-1].normalize() - pd.DateOffset(months=int(period[:-2]))
+    elif period.endswith("y"):
+        start = index[-1].normalize() - pd.DateOffset(years=int(period[:-1]))
+    else:
+        raise ValueError(f"Unsupported period: {period}")
+    return data[index >= start]
+
+
+class YahooBarCache:
+    """
+    An in-memory cache of OHLCV bars downloaded from Yahoo Finance.
+    Requests are served by resampling cached bars of a finer (or equal) interval whenever
+    those bars cover the requested period, and only go to Yahoo when nothing cached does.
+
+    Attributes:
+        max_age (float): Seconds after which cached bars are considered stale.
+        max_entries (int): Maximum number of (ticker, interval) series kept in memory.
+    """
+
+    def __init__(self, max_age: float = 60.0, max_entries: int = 64):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _download(ticker: str, period: str, interval: str) -> pd.DataFrame:
+        data = yf.download(ticker, period=period, interval=interval, auto_adjust=True, progress=False)
+        data.columns = data.columns.get_level_values(0)
+        return data[OHLCV_COLUMNS]
+
+    def _find_covering(self, ticker: str, period: str, interval: str) -> tuple | None:
+        """
+        Finds the coarsest fresh cached series from which the request can be derived.
+        Args:
+            ticker (str): The stock ticker symbol.
+            period (str): The requested period.
+            interval (str): The requested interval.
+        Returns:
+            tuple | None: The cached (interval, bars), or None if no cached series covers the request.
+        """
+        now = time.monotonic()
+        best = None
+        for (cached_ticker, cached_interval), (bars, span_days, fetched_at) in self._entries.items():
+            if cached_ticker != ticker or now - fetched_at > self.max_age:
+                continue
+            if span_days < period_days(period) or not _can_derive(cached_interval, interval):
+                continue
+            if best is None or _can_derive(best[0], cached_interval):
+                best = (cached_interval, bars)
+        return best
+
+    def get_bars(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+        """
+        Returns OHLCV bars for a ticker, deriving them from cached finer bars when possible.
+        Args:
+            ticker (str): The stock ticker symbol.
+            period (str): The Yahoo period (e.g. '1d', '5d', '1y', 'max').
+            interval (str): The Yahoo interval (e.g. '1m', '30m', '1d', '1wk').
+        Returns:
+            pd.DataFrame: A DataFrame with 'Open', 'High', 'Low', 'Close' and 'Volume' columns.
+        """
+        with self._lock:
+            covering = self._find_covering(ticker, period, interval)
+
+        if covering is None:
+            bars = self._download(ticker, period, interval)
+            self._store(ticker, period, interval, bars)
+            return bars.copy()
+
+        return self._derive(covering, period, interval)
+
+    def get_bars_many(self, tickers: list, period: str, interval: str, chunk_size: int = 100) -> dict:
+        """
+        Returns OHLCV bars for many tickers, downloading the ones not covered by the cache
+        in multi-ticker requests of `chunk_size` tickers. Downloads are only cached if they all fit
+        into `max_entries`, so a bulk load never flushes the cache it is served from; use a separate
+        YahooBarCache such as `watchlist_bar_cache` for bulk loads.
+        Args:
+            tickers (list): The stock ticker symbols.
+            period (str): The Yahoo period (e.g. '1y').
+            interval (str): The Yahoo interval (e.g. '1d').
+            chunk_size (int): Number of tickers per download request.
+        Returns:
+            dict: Maps each ticker with data to its OHLCV DataFrame.
+        """
+        bars_by_ticker = {}
+        missing = []
+        with self._lock:
+            for ticker in tickers:
+                covering = self._find_covering(ticker, period, interval)
+                if covering is None:
+                    missing.append(ticker)
+                else:
+                    bars_by_ticker[ticker] = self._derive(covering, period, interval)
+
+        cache_downloads = len(missing) <= self.max_entries
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start : start + chunk_size]
+            data = yf.download(
+                chunk, period=period, interval=interval, auto_adjust=True, group_by="ticker", progress=False
+            )
+            for ticker in chunk:
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                bars = data[ticker][OHLCV_COLUMNS].dropna(how="all")
+                if not bars.empty:
+                    if cache_downloads:
+                        self._store(ticker, period, interval, bars)
+                    bars_by_ticker[ticker] = bars.copy()
+        return bars_by_ticker
+
+    def clear(self):
+        """
+        Drops all cached bars.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, ticker: str, period: str, interval: str, bars: pd.DataFrame):
+        with self._lock:
+            self._entries[(ticker, interval)] = (bars, period_days(period), time.monotonic())
+            self._entries.move_to_end((ticker, interval))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _derive(covering: tuple, period: str, interval: str) -> pd.DataFrame:
+        cached_interval, bars = covering
+        if cached_interval != interval:
+            bars = resample_ohlcv(bars, interval)
+        return slice_period(bars, period).copy()
+
+    def fetch_since(self, ticker: str, interval: str, start: pd.Timestamp) -> pd.DataFrame:
+        """
+        Downloads only the bars from `start` onwards and appends them to the cached series.
+        The bar at `start` itself is included, as the latest bar may still have been forming.
+        Args:
+            ticker (str): The stock ticker symbol.
+            interval (str): The Yahoo interval (e.g. '1m').
+            start (pd.Timestamp): Timestamp of the last bar already held by the caller.
+        Returns:
+            pd.DataFrame: The bars from `start` onwards.
+        """
+        data = yf.download(ticker, start=start, interval=interval, auto_adjust=True, progress=False)
+        if data.empty:
+            return data
+        data.columns = data.columns.get_level_values(0)
+        new_bars = data.loc[data.index >= start, OHLCV_COLUMNS]
+
+        with self._lock:
+            entry = self._entries.get((ticker, interval))
+            if entry is not None:
+                bars, span_days, _ = entry
+                bars = pd.concat([bars[bars.index < start], new_bars])
+                self._entries[(ticker, interval)] = (bars, span_days, time.monotonic())
+        return new_bars.copy()
+
+
+bar_cache = YahooBarCache()
+
+# Bulk watchlist loads get their own store, so they neither evict the bars of the chart and the
+# technical tool nor get evicted by them. Daily bars stay fresh enough for 15 minutes.
+watchlist_bar_cache = YahooBarCache(max_age=15 * 60, max_entries=2000)
@@ -1,7 +1,38 @@
 import numpy as np
 import pandas as pd
 import talib
-import yfinance as yf
+
+from src.services.yahoo_bar_cache import bar_cache, period_days, resample_ohlcv, slice_period
+
+# Daily history needed so that the long moving averages are warmed up on each timeframe.
+TIMEFRAME_HISTORY = {"1d": "1y", "1wk": "5y", "1mo": "max"}
+
+# Indicator columns included in the compact per-timeframe snapshot.
+SNAPSHOT_COLUMNS = [
+    "Close",
+    "20_MA",
+    "50_MA",
+    "200_MA",
+    "20_EMA",
+    "RSI",
+    "RSI_State",
+    "MACD",
+    "Signal_Line",
+    "MACD_Histogram",
+    "%K",
+    "%D",
+    "ATR_Pct",
+    "Bollinger_Band_Width_Pct",
+    "Price_Above_50_MA",
+    "Price_Above_200_MA",
+    "Slope_50_MA_5d",
+    "Slope_200_MA_5d",
+    "Golden_Cross_50_200",
+    "Death_Cross_50_200",
+    "MACD_Bullish_Cross",
+    "MACD_Bearish_Cross",
+    "Volume_Spike",
+]
 
 
 class YahooTechnicalAnalyser:
@@ -218,16 +249,321 @@ class YahooTechnicalAnalyser:
 
         return enriched_df
 
-    def get_technical_data(self, period: str = "1y") -> dict:
+    @staticmethod
+    def _find_swing_pivots(high: np.ndarray, low: np.ndarray, window: int = 5) -> tuple:
+        """
+        Finds swing highs and lows: bars whose high (low) is the extreme of the surrounding
+        `window` bars on each side. Runs in O(n * window), i.e. linear for a fixed window.
+        Args:
+            high (np.ndarray): High prices.
+            low (np.ndarray): Low prices.
+            window (int): Number of bars on each side a pivot must dominate.
+        Returns:
+            tuple: Index arrays of the swing highs and of the swing lows.
+        """
+        size = 2 * window + 1
+        if len(high) < size:
+            return np.array([], dtype=int), np.array([], dtype=int)
+        rolling_max = np.lib.stride_tricks.sliding_window_view(high, size).max(axis=1)
+        rolling_min = np.lib.stride_tricks.sliding_window_view(low, size).min(axis=1)
+        pivot_highs = np.flatnonzero(high[window:-window] == rolling_max) + window
+        pivot_lows = np.flatnonzero(low[window:-window] == rolling_min) + window
+        return pivot_highs, pivot_lows
+
+    @staticmethod
+    def _cluster_levels(prices: np.ndarray, indices: np.ndarray, tolerance: float) -> list:
+        """
+        Clusters pivot prices into zones: walking up the sorted prices, a price joins the current zone
+        while it lies within `tolerance` of the zone's lowest price, so no zone is wider than `tolerance`.
+        Args:
+            prices (np.ndarray): Pivot prices.
+            indices (np.ndarray): Bar indices of the pivots.
+            tolerance (float): Maximum width of a zone.
+        Returns:
+            list: Zones as (low, high, mean level, number of touches, index of the last touch).
+        """
+        if len(prices) == 0:
+            return []
+        order = np.argsort(prices, kind="stable")
+        sorted_prices = prices[order]
+        sorted_indices = indices[order]
+        # Chaining neighbour gaps would merge a long run of close prices into one very wide zone.
+        bounds = []
+        zone_start = sorted_prices[0]
+        for position in range(1, len(sorted_prices)):
+            if sorted_prices[position] - zone_start > tolerance:
+                bounds.append(position)
+                zone_start = sorted_prices[position]
+        bounds = np.array(bounds, dtype=int)
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(sorted_prices)]))
+
+        zone_low = sorted_prices[starts]
+        zone_high = sorted_prices[ends - 1]
+        zone_mean = np.add.reduceat(sorted_prices, starts) / (ends - starts)
+        last_touch = np.maximum.reduceat(sorted_indices, starts)
+        return list(zip(zone_low, zone_high, zone_mean, ends - starts, last_touch))
+
+    @staticmethod
+    def _alternate_pivots(pivot_highs: np.ndarray, pivot_lows: np.ndarray, high: np.ndarray, low: np.ndarray) -> tuple:
+        """
+        Merges swing highs and lows into one alternating sequence, keeping the most extreme
+        pivot of every run of consecutive pivots of the same kind.
+        Args:
+            pivot_highs (np.ndarray): Indices of the swing highs.
+            pivot_lows (np.ndarray): Indices of the swing lows.
+            high (np.ndarray): High prices.
+            low (np.ndarray): Low prices.
+        Returns:
+            tuple: Arrays of pivot indices, prices and kinds (1 for a high, -1 for a low).
+        """
+        indices = np.concatenate((pivot_highs, pivot_lows))
+        kinds = np.concatenate((np.ones(len(pivot_highs), dtype=int), -np.ones(len(pivot_lows), dtype=int)))
+        prices = np.concatenate((high[pivot_highs], low[pivot_lows]))
+        order = np.argsort(indices, kind="stable")
+        indices, kinds, prices = indices[order], kinds[order], prices[order]
+
+        merged_indices, merged_prices, merged_kinds = [], [], []
+        for index, price, kind in zip(indices, prices, kinds):
+            if merged_kinds and merged_kinds[-1] == kind:
+                if price * kind > merged_prices[-1] * kind:
+                    merged_indices[-1], merged_prices[-1] = index, price
+                continue
+            merged_indices.append(index)
+            merged_prices.append(price)
+            merged_kinds.append(kind)
+        return np.array(merged_indices, dtype=int), np.array(merged_prices), np.array(merged_kinds, dtype=int)
+
+    @staticmethod
+    def _detect_patterns(
+        indices: np.ndarray,
+        prices: np.ndarray,
+        kinds: np.ndarray,
+        close: np.ndarray,
+        tolerance: float,
+        confirmation_bars: int = 20,
+    ) -> list:
+        """
+        Flags double tops/bottoms and (inverse) head and shoulders in an alternating pivot sequence.
+        A pattern is confirmed if a close within `confirmation_bars` bars after its last pivot breaks
+        its neckline; a break long after the pattern is unrelated to it.
+        Args:
+            indices (np.ndarray): Bar indices of the alternating pivots.
+            prices (np.ndarray): Prices of the alternating pivots.
+            kinds (np.ndarray): 1 for a swing high, -1 for a swing low.
+            close (np.ndarray): Close prices.
+            tolerance (float): Maximum difference between two prices considered equal.
+            confirmation_bars (int): Number of bars after the pattern in which the neckline must break.
+        Returns:
+            list: Patterns as (name, start index, end index, neckline, confirmed).
+        """
+        patterns = []
+        count = len(prices)
+
+        if count >= 3:
+            # Double top (H L H) and double bottom (L H L): equal outer pivots, middle pivot beyond tolerance.
+            first, middle, last = prices[:-2], prices[1:-1], prices[2:]
+            equal_outer = np.abs(first - last) <= tolerance
+            deep_middle = np.abs(np.minimum(first * kinds[:-2], last * kinds[:-2]) - middle * kinds[:-2]) > tolerance
+            for start in np.flatnonzero(equal_outer & deep_middle):
+                name = "Double Top" if kinds[start] == 1 else "Double Bottom"
+                patterns.append((name, start, start + 2, prices[start + 1]))
+
+        if count >= 5:
+            # Head and shoulders (H L H L H) and inverse (L H L H L): a head beyond two equal shoulders.
+            left, head, right = prices[:-4], prices[2:-2], prices[4:]
+            sign = kinds[:-4]
+            equal_shoulders = np.abs(left - right) <= tolerance
+            head_beyond = (head - np.maximum(left * sign, right * sign) * sign) * sign > tolerance
+            for start in np.flatnonzero(equal_shoulders & head_beyond):
+                name = "Head and Shoulders" if sign[start] == 1 else "Inverse Head and Shoulders"
+                neckline = (prices[start + 1] + prices[start + 3]) / 2
+                patterns.append((name, start, start + 4, neckline))
+
+        detected = []
+        for name, start, end, neckline in patterns:
+            kind = kinds[start]
+            after = close[indices[end] + 1 : indices[end] + 1 + confirmation_bars]
+            confirmed = bool(np.any(after < neckline)) if kind == 1 else bool(np.any(after > neckline))
+            detected.append((name, indices[start], indices[end], neckline, confirmed))
+        detected.sort(key=lambda pattern: pattern[2])
+        return detected
+
+    def _detect_price_structure(
+        self,
+        df: pd.DataFrame,
+        pivot_window: int = 5,
+        zone_atr_multiplier: float = 0.5,
+        max_zones: int = 3,
+        max_patterns: int = 5,
+        confirmation_bars: int = 20,
+    ) -> dict:
+        """
+        Detects swing pivots, support/resistance zones and common chart patterns over the whole
+        DataFrame and summarises them compactly, so the LLM does not need the full price history.
+
+        Args:
+            df (pd.DataFrame): Enriched DataFrame with 'High', 'Low', 'Close' and 'ATR' columns.
+            pivot_window (int): Number of bars on each side a swing pivot must dominate.
+            zone_atr_multiplier (float): Zone tolerance as a multiple of the median ATR.
+            max_zones (int): Maximum number of support and of resistance zones returned.
+            max_patterns (int): Maximum number of most recent patterns returned.
+            confirmation_bars (int): Number of bars after a pattern in which its neckline must break.
+
+        Returns:
+            dict: Nearest support and resistance zones, the latest swing high/low and recent patterns.
+        """
+        high = df["High"].to_numpy(dtype="float64")
+        low = df["Low"].to_numpy(dtype="float64")
+        close = df["Close"].to_numpy(dtype="float64")
+        dates = df.index.strftime("%Y-%m-%d")
+        last_close = close[-1]
+
+        median_atr = np.nanmedian(df["ATR"].to_numpy(dtype="float64")) if "ATR" in df.columns else np.nan
+        tolerance = zone_atr_multiplier * median_atr if np.isfinite(median_atr) else 0.01 * last_close
+
+        pivot_highs, pivot_lows = self._find_swing_pivots(high, low, pivot_window)
+        zones = self._cluster_levels(
+            np.concatenate((high[pivot_highs], low[pivot_lows])),
+            np.concatenate((pivot_highs, pivot_lows)),
+            tolerance,
+        )
+
+        def describe_zone(zone: tuple) -> dict:
+            zone_low, zone_high, level, touches, last_touch = zone
+            return {
+                "level": round(float(level), 2),
+                "zone_low": round(float(zone_low), 2),
+                "zone_high": round(float(zone_high), 2),
+                "touches": int(touches),
+                "last_touch": dates[last_touch],
+                "distance_pct": round(float((level - last_close) / last_close * 100), 2),
+            }
+
+        supports = sorted((zone for zone in zones if zone[2] < last_close), key=lambda zone: -zone[2])
+        resistances = sorted((zone for zone in zones if zone[2] >= last_close), key=lambda zone: zone[2])
+
+        indices, prices, kinds = self._alternate_pivots(pivot_highs, pivot_lows, high, low)
+        patterns = self._detect_patterns(indices, prices, kinds, close, tolerance, confirmation_bars)
+
+        return {
+            "support_zones": [describe_zone(zone) for zone in supports[:max_zones]],
+            "resistance_zones": [describe_zone(zone) for zone in resistances[:max_zones]],
+            "last_swing_high": (
+                {"date": dates[pivot_highs[-1]], "price": round(float(high[pivot_highs[-1]]), 2)}
+                if len(pivot_highs)
+                else None
+            ),
+            "last_swing_low": (
+                {"date": dates[pivot_lows[-1]], "price": round(float(low[pivot_lows[-1]]), 2)}
+                if len(pivot_lows)
+                else None
+            ),
+            "patterns": [
+                {
+                    "pattern": name,
+                    "start_date": dates[start],
+                    "end_date": dates[end],
+                    "neckline": round(float(neckline), 2),
+                    "confirmed": confirmed,
+                }
+                for name, start, end, neckline, confirmed in patterns[-max_patterns:]
+            ],
+        }
+
+    @staticmethod
+    def _compact_snapshot(row: pd.Series) -> dict:
+        """
+        Reduces the latest enriched row to the snapshot columns with JSON-friendly values.
+        Args:
+            row (pd.Series): The latest row of an enriched DataFrame.
+        Returns:
+            dict: The snapshot, with floats rounded and missing values as None.
+        """
+        snapshot = {}
+        for column in SNAPSHOT_COLUMNS:
+            value = row.get(column)
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                snapshot[column] = None
+            elif isinstance(value, (bool, np.bool_)):
+                snapshot[column] = bool(value)
+            elif isinstance(value, (int, float, np.number)):
+                snapshot[column] = round(float(value), 4)
+            else:
+                snapshot[column] = value
+        return snapshot
+
+    @staticmethod
+    def _trend(snapshot: dict) -> str:
+        """
+        Classifies the trend of a timeframe from price versus the 50-bar MA and the MA's slope.
+        Args:
+            snapshot (dict): A compact snapshot.
+        Returns:
+            str: 'bullish', 'bearish' or 'neutral'.
+        """
+        if snapshot["50_MA"] is None:
+            return "neutral"
+        if snapshot["Price_Above_50_MA"] and snapshot["Slope_50_MA_5d"] == "Positive":
+            return "bullish"
+        if not snapshot["Price_Above_50_MA"] and snapshot["Slope_50_MA_5d"] == "Negative":
+            return "bearish"
+        return "neutral"
+
+    def get_multi_timeframe_data(self, period: str = "1y", timeframes: list | None = None) -> dict:
+        """
+        Builds a combined compact snapshot over several timeframes from a single daily download.
+        The longest daily history needed is downloaded once and resampled to weekly and monthly
+        bars in memory; each timeframe is then enriched separately.
+        Args:
+            period (str): The period of the daily analysis and of the price structure detection.
+            timeframes (list): Timeframes to analyse, any of '1d', '1wk' and '1mo'.
+        Returns:
+            dict: Per-timeframe snapshots and trends, their alignment, and the daily price structure.
+        """
+        timeframes = timeframes or ["1d", "1wk", "1mo"]
+        unknown = set(timeframes) - set(TIMEFRAME_HISTORY)
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {sorted(unknown)}")
+
+        history_period = max([period] + [TIMEFRAME_HISTORY[timeframe] for timeframe in timeframes], key=period_days)
+        daily = bar_cache.get_bars(self.ticker, history_period, "1d")
+
+        result = {"ticker": self.ticker, "timeframes": {}}
+        for timeframe in timeframes:
+            bars = daily if timeframe == "1d" else resample_ohlcv(daily, timeframe)
+            enriched_data = self._enrich_with_technical_data(bars)
+            enriched_data = self._enrich_with_advanced_features(enriched_data)
+
+            snapshot = self._compact_snapshot(enriched_data.iloc[-1])
+            result["timeframes"][timeframe] = {
+                "last_bar_date": enriched_data.index[-1].strftime("%Y-%m-%d"),
+                "trend": self._trend(snapshot),
+                "indicators": snapshot,
+            }
+            if timeframe == "1d":
+                result["price_structure"] = self._detect_price_structure(slice_period(enriched_data, period))
+
+        trends = {entry["trend"] for entry in result["timeframes"].values()}
+        result["alignment"] = trends.pop() if len(trends) == 1 else "mixed"
+        return result
+
+    def get_technical_data(self, period: str = "1y", timeframes: list | None = None) -> dict:
         """
         Fetch historical market data and enrich it with technical indicators.
         Args:
             period (str): The period for which to fetch historical data. Default is '1y'.
+            timeframes (list | None): Optional timeframes ('1d', '1wk', '1mo') to analyse together;
+                see get_multi_timeframe_data.
         Returns:
-            dict: A dictionary containing the ticker, last update date, and the latest data.
+            dict: A dictionary containing the ticker, last update date, the latest data and the
+                price structure (support/resistance zones and chart patterns) over the period.
+                With timeframes, the combined multi-timeframe snapshot instead.
         """
-        data = yf.download(self.ticker, period=period, auto_adjust=True)
-        data.columns = data.columns.get_level_values(0)
+        if timeframes:
+            return self.get_multi_timeframe_data(period, timeframes)
+
+        data = bar_cache.get_bars(self.ticker, period, "1d")
 
         enriched_data = self._enrich_with_technical_data(data)
         enriched_data = self._enrich_with_advanced_features(enriched_data)
@@ -239,4 +575,5 @@ class YahooTechnicalAnalyser:
             "ticker": self.ticker,
             "last_update_date": latest_data_date,
             "latest_data": latest_data.to_dict(),
+            "price_structure": self._detect_price_structure(enriched_data),
         }
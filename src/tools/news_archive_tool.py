@@ -0,0 +1,32 @@
+import json
+
+from crewai.tools import tool
+
+from src.services.news_archive import archive_news, get_archive
+from src.services.prefetch_store import get_or_fetch
+from src.services.yahoo_news_fetcher import YahooNewsFetcher
+from src.tools.yahoo_news_tool import PREFETCH_COUNT
+
+
+@tool
+def search_news_archive(stock_symbol: str, query: str, top_k: int = 5) -> str:
+    """
+    Searches the local archive of past Yahoo Finance news for the given stock symbol.
+    The archive accumulates every article fetched over weeks of history, so it can surface
+    older stories on a specific theme (e.g. 'guidance cut', 'export restrictions').
+
+    Args:
+        stock_symbol (str): The stock ticker symbol whose news archive to search.
+        query (str): Free-text search query describing the topic of interest.
+        top_k (int): The maximum number of articles to return.
+
+    Returns:
+        str: A JSON string containing the most relevant articles with their relevance scores.
+    """
+    latest = get_or_fetch(
+        ("news", stock_symbol.upper(), PREFETCH_COUNT),
+        lambda: YahooNewsFetcher(stock_symbol).fetch_news(count=PREFETCH_COUNT),
+    )
+    archive_news(stock_symbol, latest)
+    articles = get_archive(stock_symbol).search(query, top_k=int(top_k))
+    return json.dumps(articles, indent=2)
@@ -2,10 +2,33 @@ import json
 
 from crewai.tools import tool
 
+from src.services.prefetch_store import get_or_fetch
 from src.services.reddit.reddit_sentiment import RedditSentimentAnalyser
 
 analyser = RedditSentimentAnalyser()
 
+# The subreddits and limits the research task asks the agent to use, so its call hits the prefetch.
+PREFETCH_SUBREDDITS = ["wallstreetbets", "stocks", "investing"]
+PREFETCH_POST_LIMIT = 50
+PREFETCH_DAYS = 30
+
+
+def _key(subreddits: list, stock: str, post_limit: int, days: int) -> tuple:
+    names = sorted({subreddit.strip().lower().removeprefix("r/") for subreddit in subreddits})
+    return ("reddit", stock.upper(), tuple(names), int(post_limit), int(days))
+
+
+def prefetch_jobs(stock: str) -> dict:
+    """
+    Returns the fetch jobs run ahead of the crew for the given stock.
+    Args:
+        stock (str): The stock ticker symbol.
+    Returns:
+        dict: Maps prefetch keys to zero-argument fetch callables.
+    """
+    key = _key(PREFETCH_SUBREDDITS, stock, PREFETCH_POST_LIMIT, PREFETCH_DAYS)
+    return {key: lambda: analyser.analyse(PREFETCH_SUBREDDITS, stock, PREFETCH_POST_LIMIT, PREFETCH_DAYS)}
+
 
 @tool
 def analyse_reddit(subreddits: list, stock: str, post_limit=50, days=30) -> str:
@@ -21,5 +44,26 @@ def analyse_reddit(subreddits: list, stock: str, post_limit=50, days=30) -> str:
     Returns:
         str: A JSON string containing the count of 'positive', 'neutral', and 'negative' sentiment results.
     """
-    sentiments = analyser.analyse(subreddits, stock, post_limit, days)
+    sentiments = get_or_fetch(
+        _key(subreddits, stock, post_limit, days),
+        lambda: analyser.analyse(subreddits, stock, int(post_limit), int(days)),
+    )
     return json.dumps(sentiments, indent=2)
+
+
+@tool
+def reddit_sentiment_trend(stock: str, bucket: str = "day", periods: int = 30) -> str:
+    """
+    Returns how Reddit sentiment for a given stock has changed over time, from the history of
+    posts already collected by the Reddit sentiment analysis. Nothing is fetched or re-scored.
+
+    Args:
+        stock (str): The stock ticker symbol (e.g., 'AAPL').
+        bucket (str): Time bucket of the series, either 'day' or 'hour'.
+        periods (int): Number of most recent buckets to return.
+
+    Returns:
+        str: A JSON string with one entry per bucket: post counts per sentiment, the score-weighted
+            sentiment ratio (-1 all negative to 1 all positive) and its momentum versus preceding buckets.
+    """
+    return json.dumps(analyser.trend(stock, bucket, int(periods)), indent=2)
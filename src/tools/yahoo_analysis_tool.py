@@ -1,27 +1,99 @@
 import json
+import logging
+import time
 
 from crewai.tools import tool
 
+from src.services.analysis_snapshot_store import (
+    AnalysisSnapshotStore,
+    compact_records,
+    estimate_headline,
+    flatten_analysis,
+    missing_tables,
+)
+from src.services.prefetch_store import get_or_fetch
 from src.services.yahoo_analysis_fetcher import YahooAnalysisFetcher
 
+logger = logging.getLogger(__name__)
+
+snapshot_store = AnalysisSnapshotStore()
+
+FETCH_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 1.0
+
+
+def _fetch(ticker: str) -> dict:
+    # Estimates are fetched at most once per ticker and day; later calls read today's snapshot.
+    estimates = snapshot_store.get(ticker)
+    missing = []
+    if estimates is None:
+        # Only tables the ticker had before are expected; many tickers never have some of them.
+        expected = snapshot_store.stored_tables(ticker)
+        for attempt in range(FETCH_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_DELAY_SECONDS)
+            analysis = YahooAnalysisFetcher(ticker).fetch_analysis()
+            missing = missing_tables(analysis, expected)
+            if not missing:
+                break
+        records = flatten_analysis(analysis)
+        if missing or not records:
+            # Yahoo keeps returning known tables empty: serve what arrived without storing or diffing it.
+            logger.warning("Incomplete analysis for %s after %d attempts: %s", ticker, FETCH_ATTEMPTS, missing)
+            estimates = compact_records(records)
+        else:
+            snapshot_store.save(ticker, analysis)
+            estimates = snapshot_store.get(ticker)
+    result = {
+        "ticker": ticker.upper(),
+        "as_of": snapshot_store.today(),
+        "estimates": estimates,
+        "estimate_changes": snapshot_store.changes(ticker),
+    }
+    if missing:
+        result["missing_tables"] = missing
+    return result
+
+
+def prefetch_jobs(ticker: str) -> dict:
+    """
+    Returns the fetch jobs run ahead of the crew for the given ticker.
+    Args:
+        ticker (str): The stock ticker symbol.
+    Returns:
+        dict: Maps prefetch keys to zero-argument fetch callables.
+    """
+    return {("analysis", ticker.upper()): lambda: _fetch(ticker)}
+
 
 @tool
-def fetch_yahoo_analysis(ticker: str) -> str:
+def fetch_yahoo_analysis(ticker: str, full_tables: bool = False) -> str:
     """
-    Fetches various analyses related to the stock ticker. The analyses include:
-    - Earnings Estimate
-    - Revenue Estimate
-    - Growth Estimates
-    - Earnings History
-    - EPS Trend
+    Fetches analyst estimates for the stock ticker and returns what changed. The result holds:
+    - A headline: the EPS and revenue consensus for the current quarter ('0q') and year ('0y'),
+      and the latest reported quarter against its estimate
+    - The estimates which moved since the previous distinct snapshot of the ticker: by how much, and since when
+    The full tables (Earnings Estimate, Revenue Estimate, Growth Estimates, Earnings History, EPS Trend)
+    are only included when full_tables is True.
 
     Args:
         ticker (str): The stock ticker symbol to analyze.
+        full_tables (bool): Also return every estimate table (table -> period -> field -> value).
 
     Returns:
-        str: A JSON string containing different types of analyses.
+        str: A JSON string containing the headline, the detected estimate changes and, on request,
+            the full estimate tables. 'missing_tables' lists tables Yahoo did not return this time.
     """
-    fetcher = YahooAnalysisFetcher(ticker)
-    analysis = fetcher.fetch_analysis()
+    analysis = get_or_fetch(("analysis", ticker.upper()), lambda: _fetch(ticker))
 
-    return json.dumps(analysis, indent=2)
+    result = {
+        "ticker": analysis["ticker"],
+        "as_of": analysis["as_of"],
+        "headline": estimate_headline(analysis["estimates"]),
+        "estimate_changes": analysis["estimate_changes"],
+    }
+    if "missing_tables" in analysis:
+        result["missing_tables"] = analysis["missing_tables"]
+    if full_tables:
+        result["estimates"] = analysis["estimates"]
+    return json.dumps(result, indent=2)
@@ -2,9 +2,25 @@ import json
 
 from crewai.tools import tool
 
+from src.services.prefetch_store import get_or_fetch
 from src.services.yahoo_fundamental_analyser import YahooFundamentalAnalyser
 
 
+def _fetch(ticker: str) -> dict:
+    return YahooFundamentalAnalyser(ticker).fetch_fundamentals()
+
+
+def prefetch_jobs(ticker: str) -> dict:
+    """
+    Returns the fetch jobs run ahead of the crew for the given ticker.
+    Args:
+        ticker (str): The stock ticker symbol.
+    Returns:
+        dict: Maps prefetch keys to zero-argument fetch callables.
+    """
+    return {("fundamentals", ticker.upper()): lambda: _fetch(ticker)}
+
+
 @tool
 def analyse_fundamentals(ticker: str) -> str:
     """
@@ -31,7 +47,6 @@ def analyse_fundamentals(ticker: str) -> str:
     Returns:
         str: A JSON string containing the fetched profile data.
     """
-    fetcher = YahooFundamentalAnalyser(ticker)
-    analysis = fetcher.fetch_fundamentals()
+    analysis = get_or_fetch(("fundamentals", ticker.upper()), lambda: _fetch(ticker))
 
     return json.dumps(analysis, indent=2)
@@ -2,8 +2,28 @@ import json
 
 from crewai.tools import tool
 
+from src.services.news_archive import archive_news
+from src.services.prefetch_store import get_or_fetch
 from src.services.yahoo_news_fetcher import YahooNewsFetcher
 
+# Number of articles fetched ahead of the crew; requests for up to this many are served from it.
+PREFETCH_COUNT = 30
+
+
+def _fetch(stock_symbol: str, count: int) -> list:
+    return YahooNewsFetcher(stock_symbol).fetch_news(count=count)
+
+
+def prefetch_jobs(stock_symbol: str) -> dict:
+    """
+    Returns the fetch jobs run ahead of the crew for the given stock symbol.
+    Args:
+        stock_symbol (str): The stock ticker symbol.
+    Returns:
+        dict: Maps prefetch keys to zero-argument fetch callables.
+    """
+    return {("news", stock_symbol.upper(), PREFETCH_COUNT): lambda: _fetch(stock_symbol, PREFETCH_COUNT)}
+
 
 @tool
 def fetch_yahoo_news(stock_symbol: str, count: int = 10) -> str:
@@ -17,6 +37,11 @@ def fetch_yahoo_news(stock_symbol: str, count: int = 10) -> str:
     Returns:
         str: A JSON string containing the fetched news articles.
     """
-    news_fetcher = YahooNewsFetcher(stock_symbol)
-    news_articles = news_fetcher.fetch_news(count=count)
+    count = int(count)
+    if count <= PREFETCH_COUNT:
+        key = ("news", stock_symbol.upper(), PREFETCH_COUNT)
+        news_articles = get_or_fetch(key, lambda: _fetch(stock_symbol, PREFETCH_COUNT))[:count]
+    else:
+        news_articles = _fetch(stock_symbol, count)
+    archive_news(stock_symbol, news_articles)
     return json.dumps(news_articles, indent=2)
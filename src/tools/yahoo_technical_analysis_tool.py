@@ -1,12 +1,52 @@
 import json
+import threading
 
 from crewai.tools import tool
 
-from src.services.yahoo_technical_analyser import YahooTechnicalAnalyser
+from src.services.prefetch_store import get_or_fetch
+from src.services.yahoo_bar_cache import bar_cache, period_days
+from src.services.yahoo_technical_analyser import TIMEFRAME_HISTORY, YahooTechnicalAnalyser
+
+# The timeframes the technical analyst is asked to check together.
+DEFAULT_TIMEFRAMES = ["1d", "1wk", "1mo"]
+
+
+def _key(ticker: str, period: str, timeframes: list | None) -> tuple:
+    # Timeframes are keyed in canonical order, so ['1wk', '1d'] and ['1d', '1wk'] share one entry.
+    ordered = tuple(timeframe for timeframe in TIMEFRAME_HISTORY if timeframe in set(timeframes or ()))
+    return ("technical", ticker.upper(), period, ordered)
+
+
+def _fetch(ticker: str, period: str, timeframes: list | None = None) -> dict:
+    return YahooTechnicalAnalyser(ticker).get_technical_data(period=period, timeframes=timeframes)
+
+
+def prefetch_jobs(ticker: str) -> dict:
+    """
+    Returns the fetch jobs run ahead of the crew for the given ticker: the single-timeframe analysis
+    and the multi-timeframe one the agent is asked for. Both are served from one daily download.
+    Args:
+        ticker (str): The stock ticker symbol.
+    Returns:
+        dict: Maps prefetch keys to zero-argument fetch callables.
+    """
+    history_period = max(["1y", *(TIMEFRAME_HISTORY[timeframe] for timeframe in DEFAULT_TIMEFRAMES)], key=period_days)
+    download_lock = threading.Lock()
+
+    def fetch(timeframes: list | None) -> dict:
+        # The first job downloads the full daily history; the other then finds it in the bar cache.
+        with download_lock:
+            bar_cache.get_bars(ticker, history_period, "1d")
+        return _fetch(ticker, "1y", timeframes)
+
+    return {
+        _key(ticker, "1y", None): lambda: fetch(None),
+        _key(ticker, "1y", DEFAULT_TIMEFRAMES): lambda: fetch(DEFAULT_TIMEFRAMES),
+    }
 
 
 @tool
-def analyse_technical_indicators(ticker: str, period: str = "1y") -> str:
+def analyse_technical_indicators(ticker: str, period: str = "1y", timeframes: list | None = None) -> str:
     """
     Fetches and analyses technical indicators for a given stock ticker using Yahoo Finance.
     The analysis includes various technical indicators such as:
@@ -18,14 +58,19 @@ def analyse_technical_indicators(ticker: str, period: str = "1y") -> str:
     - Stochastic Oscillator
     - Bollinger Bands
     - ATR (Average True Range)
+    It also returns the detected price structure over the period:
+    - Support and resistance zones clustered from swing highs and lows
+    - Chart patterns such as double tops/bottoms and (inverse) head and shoulders
+    When timeframes are given (e.g. ["1d", "1wk", "1mo"]), a single call returns a compact snapshot
+    of key indicators and the trend on each timeframe, plus whether the trends are aligned.
 
     Args:
         ticker (str): The stock ticker symbol to analyze.
         period (str): The time period for the analysis (default is "1y").
+        timeframes (list | None): Optional timeframes to analyse together: "1d", "1wk" and/or "1mo".
     Returns:
 
         str: A JSON string containing the fetched technical indicators.
     """
-    analyser = YahooTechnicalAnalyser(ticker)
-    data: dict = analyser.get_technical_data(period=period)
+    data: dict = get_or_fetch(_key(ticker, period, timeframes), lambda: _fetch(ticker, period, timeframes))
     return json.dumps(data, indent=2)